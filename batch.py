@@ -0,0 +1,157 @@
+from typing import Dict, Iterator, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+import functions
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Headless batch mode: every line of the input is a JSON object with "message" and optional "language"
+# (English or Ukrainian), "id", "mode" (single or parallel), "native_ukrainian" and "fast". Results are appended to
+# the output as JSON lines as soon as each request finishes, a rerun with the same output skips the lines already
+# done.
+#
+#     python batch.py requests.jsonl results.jsonl [--concurrency 4] [--mode parallel] [--fast] [--api-key sk-...]
+
+DEFAULT_CONCURRENCY = int(os.environ.get('DIET_BOT_BATCH_CONCURRENCY', 4))
+# Outcomes that are final, errors are retried by the next run
+DONE_STATUSES = ('ok', 'incorrect')
+MODES = ('single', 'parallel')
+
+
+def request_key(line_number: int, request: Dict) -> str:
+    # The explicit id, or the line number with a hash of the message so an edited input line is redone
+    if request.get('id') is not None:
+        return str(request['id'])
+    return f"{line_number}:{hashlib.sha256(request['message'].encode()).hexdigest()[:16]}"
+
+
+def read_requests(path: str) -> Iterator[Tuple[str, int, Dict]]:
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.error("Line %d of %s is not valid JSON, skipping it: %s", line_number, path, e)
+                continue
+            if not request.get('message'):
+                logger.error("Line %d of %s has no message, skipping it", line_number, path)
+                continue
+            # Checked here and not in run_request, a line that can never run would be retried by every resume
+            if request.get('language', 'English') not in functions.LANGUAGES:
+                logger.error("Line %d of %s has unknown language %r, expected one of %s, skipping it", line_number,
+                             path, request['language'], list(functions.LANGUAGES))
+                continue
+            if request.get('mode', 'single') not in MODES:
+                logger.error("Line %d of %s has unknown mode %r, expected one of %s, skipping it", line_number,
+                             path, request['mode'], list(MODES))
+                continue
+            yield request_key(line_number, request), line_number, request
+
+
+def read_done(path: str) -> Set[str]:
+    # Keys finished by earlier runs, a line cut short by a crash is ignored
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if result.get('status') in DONE_STATUSES:
+                done.add(result['key'])
+    return done
+
+
+def run_request(request: Dict, api_key: str, mode: str, fast: bool = False) -> Dict:
+    language = request.get('language', 'English')
+    started = time.perf_counter()
+    result = functions.main(request['message'], api_key, functions.LANGUAGES[language], request.get('mode', mode),
+                            request.get('native_ukrainian', False), fast=request.get('fast', fast))
+    status = 'incorrect' if result == 'Incorrect request' else 'ok'
+    return {'status': status, 'result': result if status == 'ok' else None,
+            'seconds': time.perf_counter() - started}
+
+
+def run_batch(input_path: str, output_path: str, api_key: str, mode: str = 'single',
+              concurrency: int = DEFAULT_CONCURRENCY, fast: bool = False) -> Dict:
+    done = read_done(output_path)
+    pending = [(key, line_number, request) for key, line_number, request in read_requests(input_path)
+               if key not in done]
+    logger.info("%d requests to run, %d already done in %s", len(pending), len(done), output_path)
+    counts = dict.fromkeys(DONE_STATUSES + ('error',), 0)
+    started = time.perf_counter()
+    with open(output_path, 'a', encoding='utf-8') as output, ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(run_request, request, api_key, mode, fast): (key, line_number, request)
+                   for key, line_number, request in pending}
+        try:
+            for future in as_completed(futures):
+                key, line_number, request = futures[future]
+                try:
+                    record = future.result()
+                except Exception as e:
+                    logger.exception("Request on line %d failed", line_number)
+                    record = {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+                counts[record['status']] += 1
+                record = {'key': key, 'line': line_number, 'id': request.get('id'),
+                          'language': request.get('language', 'English'), **record}
+                output.write(json.dumps(record, ensure_ascii=False) + '\n')
+                output.flush()
+                logger.info("Line %d: %s (%d of %d)", line_number, record['status'], sum(counts.values()),
+                            len(pending))
+        except KeyboardInterrupt:
+            # Requests not started yet are dropped, the finished ones are already in the output
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+    seconds = time.perf_counter() - started
+    finished = sum(counts.values())
+    return {
+        'requests': finished,
+        'skipped': len(done),
+        **counts,
+        'seconds': seconds,
+        'requests_per_minute': finished / seconds * 60 if seconds else 0.0,
+        'metrics': metrics.aggregate(metrics.history()[-finished:] if finished else []),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a JSON lines file of diet requests through the pipeline.")
+    parser.add_argument('input', help='JSON lines with "message" and optional "language", "id", "mode", '
+                                      '"native_ukrainian", "fast"')
+    parser.add_argument('output', help='JSON lines results, appended to and used to resume')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--mode', choices=MODES, default='single')
+    parser.add_argument('--fast', action='store_true', default=functions.FAST_MODE,
+                        help='generate menus with the fast model, the menu model only redoes those failing the checks')
+    parser.add_argument('--api-key', default=os.environ.get('OPENAI_API_KEY'))
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    if not args.api_key:
+        parser.error('an OpenAI API key is needed, pass --api-key or set OPENAI_API_KEY')
+
+    summary = run_batch(args.input, args.output, args.api_key, args.mode, args.concurrency, args.fast)
+    stages = summary['metrics']['stages']
+    print(f"{summary['requests']} requests in {summary['seconds']:.1f} s "
+          f"({summary['requests_per_minute']:.1f} requests/minute): {summary['ok']} ok, "
+          f"{summary['incorrect']} incorrect, {summary['error']} failed, {summary['skipped']} skipped as done")
+    if summary['metrics']['escalation_rate'] is not None:
+        print(f"  {summary['metrics']['escalation_rate']:.0%} of the fast mode requests escalated to "
+              f"{functions.MENU_MODEL}")
+    for stage, values in stages.items():
+        print(f"  {stage:<16} p50 {values['p50']:6.2f} s  p95 {values['p95']:6.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,335 @@
+"""Offline stand-ins for the OpenAI chat models and the translation service, used by the benchmarks.
+
+FakeChatModel is a ChatOpenAI that never reaches the network: structured output, tool binding and streaming go
+through the real langchain code, only the completion is produced locally after a configurable latency. It answers
+from a cassette recorded with Recorder when the prompt is in it, and with synthetic schema-valid JSON otherwise.
+Given labels (corpus entries with a "request_info" answer) and a dish pool, it answers the request calls the way
+the labels say and composes the menus from real dishes suited to the diet in the prompt, so the fast mode checks
+see menus like a model's instead of placeholder text. FakeTranslator is the googletrans stand-in.
+"""
+from typing import Dict, List, Optional
+from itertools import count
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import typing
+from types import SimpleNamespace
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.pydantic_v1 import BaseModel, Field
+from langchain_openai import ChatOpenAI
+
+import compact_menu
+import diets
+import functions
+import menu_checks
+import prompts
+
+SCHEMAS = {model.__name__: model for model in (
+    functions.UserInfo, functions.Indication, functions.RequestInfo, functions.DailyMenu, functions.DailyMenuList,
+    compact_menu.CompactMenu, compact_menu.CompactMenuList)}
+# Lengths of the synthetic lists by field name: menus, meals and dishes in both the full and the compact schema,
+# as many menus and meals as the prompt asks for
+LIST_LENGTHS = {'menus': functions.MENUS_NUMBER, 'ms': functions.MENUS_NUMBER, 'meals': functions.MEALS_NUMBER,
+                'm': functions.MEALS_NUMBER, 'dishes': 2, 'ds': 2}
+DEFAULT_LIST_LENGTH = 4
+# Synthetic menus that fail_menu can break, with the key of their menu and meal lists
+MENU_SCHEMAS = {'DailyMenuList': ('menus', 'meals'), 'CompactMenuList': ('ms', 'm'), 'DailyMenu': (None, 'meals'),
+                'CompactMenu': (None, 'm')}
+FIELD_VALUES = {'is_valid': True, 'indication_index': 0, 'allergies': 'None', 'intolerances': 'None',
+                'exclude': 'None', 'add': 'None', 'currency': 'UAH'}
+MEAL_DESCRIPTIONS = ['Breakfast', 'Second breakfast', 'Lunch', 'Afternoon snack', 'Dinner', 'Before bed']
+# Share of a dish's ingredients that must be among the diet's recommended foods for a realistic menu to use it
+SUITABLE_SHARE = 0.5
+# Characters per streamed chunk, a few tokens like the provider's deltas
+STREAM_CHUNK_CHARS = 16
+
+_counters_lock = threading.Lock()
+
+
+def prompt_text(messages) -> str:
+    return '\n'.join(str(message.content) for message in messages)
+
+
+def cassette_key(prompt: str, tools: Optional[List[Dict]]) -> str:
+    tool_name = tools[0]['function']['name'] if tools else None
+    return hashlib.sha256(json.dumps([tool_name, prompt], ensure_ascii=False).encode()).hexdigest()
+
+
+def schema_name(prompt: str, tools: Optional[List[Dict]]) -> Optional[str]:
+    # The bound tool in structured mode, otherwise the schema in the parser's format instructions
+    if tools:
+        return tools[0]['function']['name']
+    match = re.search(r'```\n(\{.*?\})\n```', prompt, re.S)
+    if match:
+        properties = set(json.loads(match.group(1)).get('properties', {}))
+        for name, model in SCHEMAS.items():
+            if set(model.__fields__) == properties:
+                return name
+    return None
+
+
+def synthetic(model, counter) -> Dict:
+    # Schema-valid data for a pydantic model, every string is unique so translation sees distinct texts
+    def value(name, field_type):
+        if isinstance(field_type, type) and issubclass(field_type, BaseModel):
+            return synthetic(field_type, counter)
+        if field_type is bool:
+            return True
+        if field_type is int:
+            return 1
+        if field_type is float:
+            return 45.0
+        return f"{name} {next(counter)}"
+
+    data = {}
+    for name, field in model.__fields__.items():
+        if name in FIELD_VALUES:
+            data[name] = FIELD_VALUES[name]
+        elif typing.get_origin(field.outer_type_) in (list, List):
+            data[name] = [value(name, field.type_) for _ in range(LIST_LENGTHS.get(name, DEFAULT_LIST_LENGTH))]
+        else:
+            data[name] = value(name, field.type_)
+    return data
+
+
+def fail_menu(data: Dict, name: str) -> Dict:
+    # Drops the last meal of the first menu, a failure the fast mode checks always catch
+    menus_key, meals_key = MENU_SCHEMAS[name]
+    menu = data[menus_key][0] if menus_key else data
+    menu[meals_key] = menu[meals_key][:-1]
+    return data
+
+
+def labelled(prompt: str, labels: List[Dict]) -> Optional[Dict]:
+    # The label of the corpus message the prompt quotes, the indication call only quotes its health_info
+    for entry in labels:
+        info = entry.get('request_info')
+        if info is not None and (entry['message'] in prompt
+                                 or f"'{info.get('health_info')}'" in prompt):
+            return info
+    return None
+
+
+def labelled_answer(info: Dict, name: str) -> Dict:
+    if not info.get('is_valid', True):
+        return {'is_valid': False, 'indication_index': None,
+                **{field: 'None' for field in functions.UserInfo.__fields__}}
+    names = [diet['diet_name'] for diet in diets.get_store().diet_list('en')]
+    data = {field: info.get(field) or 'None' for field in functions.UserInfo.__fields__}
+    data.update(is_valid=True, indication_index=names.index(info['diet']), explanation=f"labelled {info['diet']}")
+    return {field: data[field] for field in SCHEMAS[name].__fields__}
+
+
+def suitable_dishes(prompt: str, dishes: List[Dict]) -> List[Dict]:
+    # The dishes a model would pick for the prompt: mostly made of the diet's recommended foods, without the
+    # user's allergens, intolerances and exclusions and not named after one of the diet's excluded foods. Excluded
+    # foods among the ingredients (the milk of a porridge) slip through and are left to the checks.
+    match = re.search(r"Dietary recommendations of '[^\n]*?': (\{.*\})\n", prompt)
+    temp = json.loads(match.group(1)) if match else {}
+    recommended = [menu_checks.stems(item) for item in menu_checks.split_items(temp.get('recommended_foods'))]
+    user_info = {}
+    match = re.search(r"allergies: '(.*?)' and intolerances: '(.*?)'\. ", prompt)
+    if match:
+        user_info.update(allergies=match.group(1), intolerances=match.group(2))
+    match = re.search(r"products such as: (.*?), but on the contrary", prompt)
+    if match:
+        user_info['exclude'] = match.group(1)
+    avoid = [term_stems for source in ('allergies', 'intolerances', 'exclude')
+             for _, term_stems in menu_checks.term_patterns(menu_checks.split_terms(user_info.get(source)),
+                                                            allergens=source != 'exclude')]
+
+    def share(dish):
+        return sum(any(menu_checks.matches(item, menu_checks.stems(ingredient)) for item in recommended)
+                   for ingredient in dish['ingredients']) / len(dish['ingredients'])
+    excluded = [menu_checks.stems(item) for item in menu_checks.split_items(temp.get('excluded_foods'))]
+    allowed = [dish for dish in dishes
+               if not any(menu_checks.matches(term_stems, menu_checks.stems(text)) for term_stems in avoid
+                          for text in [dish['name']] + dish['ingredients'])
+               and not any(term_stems and menu_checks.matches(term_stems, menu_checks.stems(dish['name']))
+                           for term_stems in excluded)]
+    suited = [dish for dish in allowed if share(dish) >= SUITABLE_SHARE]
+    return suited if len(suited) >= 2 * len(MEAL_DESCRIPTIONS) else allowed
+
+
+def realistic_menus(prompt: str, name: str, dishes: List[Dict], rng: random.Random) -> Dict:
+    # Menus of the schema made of two suitable dishes per meal
+    menus_key, meals_key = MENU_SCHEMAS[name]
+    compact = name.startswith('Compact')
+    pool = suitable_dishes(prompt, dishes)
+
+    def meal(number):
+        chosen = rng.sample(pool, 2)
+        if compact:
+            return {'d': MEAL_DESCRIPTIONS[number % len(MEAL_DESCRIPTIONS)],
+                    'ds': [{'n': dish['name'], 'i': dish['ingredients'], 'c': dish['cooking_instructions'],
+                            'p': dish['price']} for dish in chosen]}
+        return {'meal_number': number + 1, 'description': MEAL_DESCRIPTIONS[number % len(MEAL_DESCRIPTIONS)],
+                'dishes': chosen, 'total_price': sum(dish['price'] for dish in chosen)}
+
+    def menu():
+        meals = [meal(number) for number in range(functions.MEALS_NUMBER)]
+        if compact:
+            return {meals_key: meals}
+        return {meals_key: meals, 'meals_number': len(meals),
+                'total_price': sum(meal['total_price'] for meal in meals), 'currency': 'UAH'}
+    return {menus_key: [menu() for _ in range(functions.MENUS_NUMBER)]} if menus_key else menu()
+
+
+class FakeChatModel(ChatOpenAI):
+    latency: float = 0.5
+    # Added per completion token, generation time grows with the output like the provider's
+    seconds_per_token: float = 0.0
+    # Share of the menus broken to fail the fast mode checks, drawn from a seeded generator so every run fails
+    # the same calls
+    failure_rate: float = 0.0
+    cassette: Optional[Dict] = None
+    # Corpus entries with their expected request_info and the dish pool of realistic menus, see the module docstring
+    labels: Optional[List[Dict]] = None
+    dishes: Optional[List[Dict]] = None
+    # Calls, prompt and completion tokens and cassette hits of this model
+    counters: Dict = Field(default_factory=lambda: {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0,
+                                                    'replayed': 0})
+    counter: typing.Any = Field(default_factory=count)
+    rng: typing.Any = Field(default_factory=lambda: random.Random(0))
+
+    def _respond(self, messages, kwargs):
+        prompt = prompt_text(messages)
+        tools = kwargs.get('tools')
+        name = schema_name(prompt, tools)
+        recorded = (self.cassette or {}).get(cassette_key(prompt, tools))
+        if recorded is not None:
+            content = recorded['content'] or ''
+            tool_calls = recorded.get('tool_calls')
+        else:
+            info = labelled(prompt, self.labels) if self.labels and name in SCHEMAS else None
+            if info is not None and name not in MENU_SCHEMAS:
+                data = labelled_answer(info, name)
+            elif self.dishes and name in MENU_SCHEMAS:
+                data = realistic_menus(prompt, name, self.dishes, self.rng)
+            else:
+                data = synthetic(SCHEMAS[name], self.counter) if name in SCHEMAS else {}
+            if name in MENU_SCHEMAS and self.failure_rate and self.rng.random() < self.failure_rate:
+                data = fail_menu(data, name)
+            content = json.dumps(data)
+            tool_calls = [{'id': 'call_0', 'type': 'function',
+                           'function': {'name': name, 'arguments': content}}] if tools else None
+            if tool_calls:
+                content = ''
+        completion = tool_calls[0]['function']['arguments'] if tool_calls else content
+        usage = (recorded or {}).get('token_usage') or {
+            'prompt_tokens': prompts.count_tokens(prompt, self.model_name),
+            'completion_tokens': prompts.count_tokens(completion, self.model_name),
+        }
+        with _counters_lock:
+            self.counters['calls'] += 1
+            self.counters['prompt_tokens'] += usage['prompt_tokens']
+            self.counters['completion_tokens'] += usage['completion_tokens']
+            self.counters['replayed'] += recorded is not None
+        message = AIMessage(content=content, additional_kwargs={'tool_calls': tool_calls} if tool_calls else {},
+                            response_metadata={'token_usage': usage, 'model_name': self.model_name})
+        return message, self.latency + self.seconds_per_token * usage['completion_tokens']
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message, delay = self._respond(messages, kwargs)
+        time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=message)],
+                          llm_output={'token_usage': message.response_metadata['token_usage'],
+                                      'model_name': self.model_name})
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message, delay = self._respond(messages, kwargs)
+        await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=message)],
+                          llm_output={'token_usage': message.response_metadata['token_usage'],
+                                      'model_name': self.model_name})
+
+    def _chunks(self, messages, kwargs):
+        message, delay = self._respond(messages, kwargs)
+        pieces = [message.content[i:i + STREAM_CHUNK_CHARS]
+                  for i in range(0, len(message.content), STREAM_CHUNK_CHARS)] or ['']
+        return pieces, self.latency, (delay - self.latency) / len(pieces)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        pieces, first_delay, chunk_delay = self._chunks(messages, kwargs)
+        time.sleep(first_delay)
+        for piece in pieces:
+            time.sleep(chunk_delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        pieces, first_delay, chunk_delay = self._chunks(messages, kwargs)
+        await asyncio.sleep(first_delay)
+        for piece in pieces:
+            await asyncio.sleep(chunk_delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+
+
+def fake_model_factory(latency: float = 0.5, seconds_per_token: float = 0.0, cassette: Optional[Dict] = None,
+                       models: Optional[List] = None, overrides: Optional[Dict[str, Dict]] = None,
+                       labels: Optional[List[Dict]] = None, dishes: Optional[List[Dict]] = None):
+    # A factory for clients.set_model_factory, every model it builds is appended to models. overrides maps
+    # model names to FakeChatModel fields, e.g. a lower latency or a failure_rate for the fast model.
+    def factory(api_key: str, model: str) -> FakeChatModel:
+        fields = dict({'latency': latency, 'seconds_per_token': seconds_per_token, 'labels': labels,
+                       'dishes': dishes}, **(overrides or {}).get(model, {}))
+        chat_model = FakeChatModel(openai_api_key=api_key, model=model, cassette=cassette, **fields)
+        if models is not None:
+            models.append(chat_model)
+        return chat_model
+    return factory
+
+
+class Recorder(BaseCallbackHandler):
+    # Callback handler for real chat models that stores every completion in a cassette, keyed like the replay
+    def __init__(self, cassette: Optional[Dict] = None):
+        self.cassette = cassette if cassette is not None else {}
+        self.counters = {}
+        self._keys = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        tools = (kwargs.get('invocation_params') or {}).get('tools')
+        with self._lock:
+            self._keys[run_id] = cassette_key(prompt_text(messages[0]), tools)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        message = response.generations[0][0].message
+        usage = (response.llm_output or {}).get('token_usage') or {}
+        model_name = (response.llm_output or {}).get('model_name', '')
+        with self._lock:
+            key = self._keys.pop(run_id, None)
+            if key is not None:
+                self.cassette[key] = {'content': message.content,
+                                      'tool_calls': message.additional_kwargs.get('tool_calls'),
+                                      'token_usage': {'prompt_tokens': usage.get('prompt_tokens', 0),
+                                                      'completion_tokens': usage.get('completion_tokens', 0)}
+                                      if usage else None}
+            counters = self.counters.setdefault(model_name, {'calls': 0, 'prompt_tokens': 0,
+                                                             'completion_tokens': 0})
+            counters['calls'] += 1
+            counters['prompt_tokens'] += usage.get('prompt_tokens', 0)
+            counters['completion_tokens'] += usage.get('completion_tokens', 0)
+
+
+class FakeTranslator:
+    # googletrans stand-in: marks every line with the destination language after a fixed latency
+    def __init__(self, latency: float = 0.2, seconds_per_char: float = 0.0):
+        self.latency = latency
+        self.seconds_per_char = seconds_per_char
+        self.calls = 0
+        self.characters = 0
+        self._lock = threading.Lock()
+
+    def translate(self, text, dest='en', src='auto'):
+        with self._lock:
+            self.calls += 1
+            self.characters += len(text)
+        time.sleep(self.latency + self.seconds_per_char * len(text))
+        return SimpleNamespace(text='\n'.join(f"[{dest}] {line}" for line in text.split('\n')), src=src, dest=dest)
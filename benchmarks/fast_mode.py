@@ -0,0 +1,104 @@
+"""Latency and escalation rate of the fast mode cascade against the default menu generation.
+
+benchmarks/pipeline.py runs the same corpus twice in fresh interpreters, once as is and once with --fast, and the
+message wall times, menu stage times, model calls and the share of fast mode requests that escalated to the menu
+model are compared. The default speeds of the fake models are the providers' time to first token and time per
+output token scaled down by ten. The fakes answer the request calls from the corpus labels and compose the menus
+of real dishes suited to each diet (pipeline.py --realistic), so the escalation rate is what the checks make of
+such menus; --fast-model-failure-rate additionally breaks a share of the fast model's menus. --synthetic falls back
+to placeholder menus, which only fail when broken. With --replay both runs answer from a recorded cassette: prompts
+that are not in it (the fast model's menus, unless they were recorded with --fast) get the fake answers.
+
+    python benchmarks/fast_mode.py [--corpus benchmarks/corpus.jsonl] [--mode single|parallel|stream]
+        [--fast-model-failure-rate 0] [--synthetic] [--replay cassette.json] [--json fast_mode.json]
+        [-- pipeline options]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+# Seconds to the first token and per output token, a tenth of the usual gpt-4-turbo and gpt-3.5-turbo figures
+MODEL_LATENCY = 0.1
+SECONDS_PER_TOKEN = 0.004
+FAST_MODEL_LATENCY = 0.05
+FAST_MODEL_SECONDS_PER_TOKEN = 0.0012
+MENU_STAGES = ['get_diet_options_fast', 'get_diet_options', 'get_diet_options_parallel', 'stream_diet_options']
+
+
+def run_pipeline(options, fast):
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+        path = f.name
+    try:
+        subprocess.run([sys.executable, os.path.join(BENCHMARKS, 'pipeline.py'), '--no-tracemalloc', '--json', path,
+                        *options, *(['--fast'] if fast else [])], check=True, stdout=subprocess.DEVNULL)
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        os.remove(path)
+
+
+def run_summary(results):
+    escalated = [row['escalated'] for row in results['messages'] if row['menus']]
+    return {
+        'message_seconds': {key: results['message_seconds'][key] for key in ('mean', 'p50', 'p95', 'max')},
+        'menu_stage_seconds': {stage: results['stages'][stage]['mean'] for stage in MENU_STAGES
+                               if stage in results['stages']},
+        'models': {model: {key: counters[key] for key in ('calls', 'prompt_tokens', 'completion_tokens')}
+                   for model, counters in results['models'].items()},
+        'requests_with_menus': len(escalated),
+        'escalated': sum(escalated),
+        'escalation_rate': results['escalation_rate'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', default=os.path.join(BENCHMARKS, 'corpus.jsonl'))
+    parser.add_argument('--mode', choices=['single', 'parallel', 'stream'], default='single')
+    parser.add_argument('--model-latency', type=float, default=MODEL_LATENCY)
+    parser.add_argument('--seconds-per-token', type=float, default=SECONDS_PER_TOKEN)
+    parser.add_argument('--fast-model-latency', type=float, default=FAST_MODEL_LATENCY)
+    parser.add_argument('--fast-model-seconds-per-token', type=float, default=FAST_MODEL_SECONDS_PER_TOKEN)
+    parser.add_argument('--fast-model-failure-rate', type=float, default=0.0)
+    parser.add_argument('--synthetic', action='store_true', help='placeholder menus instead of real dishes')
+    parser.add_argument('--replay', help='answer from this cassette where it has the prompt')
+    parser.add_argument('--json', help='write the comparison to this file')
+    parser.add_argument('pipeline_options', nargs='*', help='passed on to benchmarks/pipeline.py after --')
+    args = parser.parse_args()
+
+    options = ['--corpus', args.corpus, '--mode', args.mode, '--model-latency', str(args.model_latency),
+               '--seconds-per-token', str(args.seconds_per_token),
+               '--fast-model-latency', str(args.fast_model_latency),
+               '--fast-model-seconds-per-token', str(args.fast_model_seconds_per_token),
+               '--fast-model-failure-rate', str(args.fast_model_failure_rate),
+               *([] if args.synthetic else ['--realistic']),
+               *(['--replay', args.replay] if args.replay else []), *args.pipeline_options]
+    results = {'config': {name: value for name, value in vars(args).items()},
+               'default': run_summary(run_pipeline(options, fast=False)),
+               'fast': run_summary(run_pipeline(options, fast=True))}
+
+    print(f"{'':<10} {'mean':>8} {'p50':>8} {'p95':>8}  menu stage  escalated")
+    for name in ('default', 'fast'):
+        summary = results[name]
+        seconds = summary['message_seconds']
+        # The outermost menu stage of the run, the cascade includes the calls of both models
+        menu_seconds = next(iter(summary['menu_stage_seconds'].values()), 0.0)
+        escalated = (f"{summary['escalated']}/{summary['requests_with_menus']}"
+                     if summary['escalation_rate'] is not None else '-')
+        print(f"{name:<10} {seconds['mean']:7.2f}s {seconds['p50']:7.2f}s {seconds['p95']:7.2f}s  "
+              f"{menu_seconds:9.2f}s  {escalated}")
+        for model, counters in summary['models'].items():
+            print(f"  {model:<24} {counters['calls']:4d} calls {counters['completion_tokens']:7d} completion tokens")
+    speedup = results['default']['message_seconds']['mean'] / (results['fast']['message_seconds']['mean'] or 1)
+    print(f"fast mode: {speedup:.2f}x mean message speed")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
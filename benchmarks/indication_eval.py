@@ -0,0 +1,66 @@
+"""Labelled evaluation of the local indication matcher (indication_index.match).
+
+Every line of the eval set is a health description with the diets that are right for it. Reported per line: the
+top ranked diet, whether the match is confident and whether the expected diets are among the candidates passed to
+the LLM. A confident match on a wrong diet skips the LLM entirely, so those are listed as errors and make the
+script exit with status 1.
+
+    python benchmarks/indication_eval.py [--eval benchmarks/indication_eval.jsonl] [--json indication_eval.json]
+"""
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import diets  # noqa: E402
+import indication_index  # noqa: E402
+
+DEFAULT_EVAL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'indication_eval.jsonl')
+
+
+def evaluate(entries):
+    names = [diet['diet_name'] for diet in diets.get_store().diet_list('en')]
+    rows = []
+    for entry in entries:
+        result = indication_index.match(entry['text'])
+        best = indication_index.get_index().rank(entry['text'])[0][0]
+        rows.append({
+            'text': entry['text'],
+            'expected': entry['expected'],
+            'top': names[best],
+            'top_correct': names[best] in entry['expected'],
+            'confident': result['confident'],
+            'confident_wrong': result['confident'] and names[result['indication_index']] not in entry['expected'],
+            'in_candidates': any(names[index] in entry['expected'] for index in result['candidates']),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--eval', default=DEFAULT_EVAL)
+    parser.add_argument('--json', help='write the rows and totals to this file')
+    args = parser.parse_args()
+
+    with open(args.eval, encoding='utf-8') as f:
+        rows = evaluate([json.loads(line) for line in f if line.strip()])
+    for row in rows:
+        mark = 'WRONG' if row['confident_wrong'] else ('ok' if row['top_correct'] else 'miss')
+        print(f"{mark:<6} {'confident' if row['confident'] else 'to LLM':<10} "
+              f"{'' if row['in_candidates'] else 'not in candidates '}{row['top']:<12} {row['text']}")
+    totals = {key: sum(row[key] for row in rows) for key in ('top_correct', 'confident', 'confident_wrong',
+                                                            'in_candidates')}
+    print(f"{len(rows)} cases: {totals['top_correct']} top-1 correct, {totals['in_candidates']} with the right "
+          f"diet among the candidates, {totals['confident']} confident, {totals['confident_wrong']} confident "
+          f"and wrong")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'rows': rows, 'totals': totals}, f, indent=2, ensure_ascii=False)
+    sys.exit(1 if totals['confident_wrong'] else 0)
+
+
+if __name__ == '__main__':
+    main()
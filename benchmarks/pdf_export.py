@@ -0,0 +1,91 @@
+"""Bulk PDF export, cold against warm per-menu cache.
+
+Every format is exported from the same synthetic menus, once from an empty PDF cache and once after the
+per-menu PDFs were rendered (as the page does for its per-menu download buttons).
+
+    python benchmarks/pdf_export.py [--menus 3] [--meals 5] [--repeat 3] [--json pdf_export.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pdf_generator  # noqa: E402
+
+
+SAMPLE_TEXT = {
+    'en': {'dish': "Steamed vegetables with rice", 'meal': "Meal {} of the day",
+           'ingredients': ['rice', 'carrot', 'zucchini', 'broccoli', 'olive oil', 'salt'],
+           'instructions': "Rinse the rice and cook it in salted water for 15 minutes. Steam the chopped "
+                           "vegetables for 10 minutes, season with olive oil and serve with the rice. ",
+           'currency': 'UAH'},
+    'uk': {'dish': "Овочі на пару з рисом", 'meal': "Прийом їжі {} за день",
+           'ingredients': ['рис', 'морква', 'кабачок', 'броколі', 'оливкова олія', 'сіль'],
+           'instructions': "Промийте рис і варіть його в підсоленій воді 15 хвилин. Готуйте нарізані овочі на "
+                           "пару 10 хвилин, заправте оливковою олією та подавайте з рисом. ",
+           'currency': 'грн'},
+}
+
+
+def sample_menu(meals, seed=0, language='en'):
+    # A menu shaped like the app's expanded DailyMenu output
+    text = SAMPLE_TEXT[language]
+    dishes = lambda j: [{
+        'name': f"{text['dish']} {seed}.{j}.{k}",
+        'ingredients': text['ingredients'],
+        'cooking_instructions': text['instructions'] * 2,
+        'price': 45,
+    } for k in range(3)]
+    return {
+        'total_price': 135 * meals,
+        'currency': text['currency'],
+        'meals': [{'meal_number': j + 1, 'description': text['meal'].format(j + 1), 'dishes': dishes(j),
+                   'total_price': 135} for j in range(meals)],
+    }
+
+
+def best_time(fn, repeat, warm=()):
+    times = []
+    for _ in range(repeat):
+        with pdf_generator._pdf_cache_lock:
+            pdf_generator._pdf_cache.clear()
+        for menu in warm:
+            pdf_generator.generate_pdf(menu)
+        started = time.perf_counter()
+        data = fn()
+        times.append(time.perf_counter() - started)
+    return min(times), len(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--menus', type=int, default=3)
+    parser.add_argument('--meals', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args()
+
+    menus = [sample_menu(args.meals, seed) for seed in range(args.menus)]
+    # Register the fonts outside of the timed runs
+    pdf_generator.render_pdf(menus[0])
+
+    results = {'menus': args.menus, 'meals': args.meals}
+    for combined in (True, False):
+        export_format = 'combined' if combined else 'zip'
+        for warm in (False, True):
+            seconds, size = best_time(lambda: pdf_generator.export_menus(menus, combined), args.repeat,
+                                      menus if warm else ())
+            name = f"{export_format}_{'warm' if warm else 'cold'}"
+            results[name] = {'seconds': seconds, 'bytes': size}
+            print(f"{name:<16} {seconds * 1000:8.1f} ms {size / 1024:8.1f} KiB")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
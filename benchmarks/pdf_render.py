@@ -0,0 +1,74 @@
+"""Rendering cost of one menu PDF, English and Ukrainian.
+
+Each menu is rendered repeatedly (the PDF cache is bypassed) with the process-wide styles and TTF font, and
+the first render of a process, which registers the font and builds the styles, is reported separately. For
+comparison the pre-shared path is rendered too: a fresh sample style sheet per document and Helvetica, which
+has no Cyrillic glyphs.
+
+    python benchmarks/pdf_render.py [--meals 5] [--repeat 20] [--json pdf_render.json]
+"""
+import argparse
+import io
+import json
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pdf_generator  # noqa: E402
+from pdf_export import sample_menu  # noqa: E402
+from reportlab.lib.pagesizes import A4  # noqa: E402
+from reportlab.lib.styles import getSampleStyleSheet  # noqa: E402
+from reportlab.platypus import SimpleDocTemplate  # noqa: E402
+
+
+def render_legacy(diet):
+    # A new style sheet per document with the default Helvetica fonts, as generate_pdf used to render
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    doc.build(pdf_generator.menu_content(diet, getSampleStyleSheet()))
+    return buffer.getvalue()
+
+
+def page_count(pdf):
+    return len(re.findall(rb'/Type /Page\b(?!s)', pdf))
+
+
+def measure(render, diet, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        pdf = render(diet)
+        times.append(time.perf_counter() - started)
+    pages = page_count(pdf)
+    return {'pages': pages, 'bytes': len(pdf), 'seconds': min(times), 'seconds_per_page': min(times) / pages}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--meals', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args()
+
+    menus = {language: sample_menu(args.meals, language=language) for language in ('en', 'uk')}
+    started = time.perf_counter()
+    pdf_generator.render_pdf(menus['en'])
+    results = {'first_render_seconds': time.perf_counter() - started, 'fonts': pdf_generator.register_fonts()}
+    for language, menu in menus.items():
+        for name, render in (('shared', pdf_generator.render_pdf), ('legacy', render_legacy)):
+            result = measure(render, menu, args.repeat)
+            results[f"{language}_{name}"] = result
+            print(f"{language}_{name:<8} {result['pages']:3d} pages {result['seconds_per_page'] * 1000:8.2f} ms/page "
+                  f"{result['bytes'] / 1024:8.1f} KiB")
+    print(f"first render {results['first_render_seconds'] * 1000:.1f} ms, fonts {results['fonts']['normal']}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
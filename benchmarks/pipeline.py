@@ -0,0 +1,245 @@
+"""Offline benchmark of the whole pipeline with fake or recorded chat models and a fake translator.
+
+Every message of the corpus (JSON lines with "message" and "language", English or Ukrainian) runs through
+functions.main or functions.run_stream. The chat models come from fakes.FakeChatModel, which replays a cassette
+when one is given and answers with synthetic schema-valid JSON after the configured latency otherwise. The
+translator is fakes.FakeTranslator. With --record the real OpenAI models and googletrans are used and every
+completion is written to the cassette for later replays. With --fast the menus go through the fast mode cascade,
+the --fast-model-* options give the fake fast model its own speed and a share of menus that fail the checks.
+With --realistic the fakes answer the request calls from the corpus' "request_info" labels and compose the menus
+from the --dishes pool by the diet in the prompt, so the checks run on menus of real dishes.
+
+Reported as JSON: wall time per message, per stage wall time, model calls and tokens, translation calls,
+parse and repair counts, fast mode escalations, and tracemalloc allocations. The result and menu caches are
+cleared before every message unless --warm is given, the translation memory is a fresh file per run.
+
+    python benchmarks/pipeline.py [--corpus benchmarks/corpus.jsonl] [--mode single|parallel|stream] [--native]
+        [--unfused] [--model-latency 0.5] [--seconds-per-token 0.002] [--translator-latency 0.2]
+        [--fast] [--fast-model-latency 0.3] [--fast-model-seconds-per-token 0.0005] [--fast-model-failure-rate 0.3]
+        [--realistic] [--dishes benchmarks/dishes.json]
+        [--replay cassette.json | --record cassette.json --api-key sk-...] [--warm] [--json pipeline.json]
+"""
+import argparse
+import functools
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Isolated caches, set before the modules read them
+_cache_dir = tempfile.mkdtemp(prefix='diet-bot-benchmark-')
+os.environ['DIET_BOT_TRANSLATION_MEMORY'] = os.path.join(_cache_dir, 'translations.sqlite3')
+os.environ['DIET_BOT_RESULT_CACHE'] = 'memory'
+
+import clients  # noqa: E402
+import compact_menu  # noqa: E402
+import fakes  # noqa: E402
+import functions  # noqa: E402
+import metrics  # noqa: E402
+import prompts  # noqa: E402
+import result_cache  # noqa: E402
+import singleflight  # noqa: E402
+import translation  # noqa: E402
+import translation_memory  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus.jsonl')
+DEFAULT_DISHES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dishes.json')
+# Module level functions of the pipeline that are timed, the outer ones include the inner ones
+STAGES = ['get_diet_request', 'get_request_info', 'get_user_info', 'get_indication_info', 'get_diet_options_fast',
+          'get_diet_options', 'get_diet_options_parallel', 'stream_diet_options', 'translate_dict']
+
+stage_times = {}
+
+
+def record_stage(stage, seconds):
+    stage_times.setdefault(stage, []).append(seconds)
+
+
+def timed(stage, fn):
+    if stage == 'stream_diet_options':
+        @functools.wraps(fn)
+        def generator_wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                yield from fn(*args, **kwargs)
+            finally:
+                record_stage(stage, time.perf_counter() - started)
+        return generator_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            record_stage(stage, time.perf_counter() - started)
+    return wrapper
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(share * (len(values) - 1))))] if values else 0.0
+
+
+def summary(values):
+    return {'calls': len(values), 'total': sum(values), 'mean': sum(values) / len(values) if values else 0.0,
+            'p50': percentile(values, 0.5), 'p95': percentile(values, 0.95), 'max': max(values, default=0.0)}
+
+
+def load_corpus(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def clear_caches():
+    with result_cache._result_cache_lock:
+        result_cache._result_cache = None
+    with result_cache._menu_cache_lock:
+        result_cache._menu_cache = None
+
+
+def run_message(entry, args, api_key):
+    language = functions.LANGUAGES[entry.get('language', 'English')]
+    if args.mode == 'stream':
+        return functions.run_stream(entry['message'], api_key, language, args.native, not args.unfused,
+                                    fast=args.fast)
+    return functions.main(entry['message'], api_key, language, args.mode, args.native, not args.unfused,
+                          fast=args.fast)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--mode', choices=['single', 'parallel', 'stream'], default='single')
+    parser.add_argument('--native', action='store_true', help='generate Ukrainian menus natively')
+    parser.add_argument('--unfused', action='store_true', help='separate user info and indication calls')
+    parser.add_argument('--model-latency', type=float, default=0.5, help='seconds before every completion')
+    parser.add_argument('--seconds-per-token', type=float, default=0.0, help='added per completion token')
+    parser.add_argument('--translator-latency', type=float, default=0.2, help='seconds per translation call')
+    parser.add_argument('--fast', action='store_true', help='fast mode: menus from the fast model, checked locally')
+    parser.add_argument('--fast-model-latency', type=float, help='--model-latency of the fast model')
+    parser.add_argument('--fast-model-seconds-per-token', type=float, help='--seconds-per-token of the fast model')
+    parser.add_argument('--fast-model-failure-rate', type=float, default=0.0,
+                        help='share of fast model menus that are broken to fail the fast mode checks')
+    parser.add_argument('--realistic', action='store_true', help='labelled request answers and menus of real dishes')
+    parser.add_argument('--dishes', default=DEFAULT_DISHES, help='dish pool of --realistic menus')
+    parser.add_argument('--replay', help='answer from this cassette where it has the prompt')
+    parser.add_argument('--record', help='use the real services and write their completions to this cassette')
+    parser.add_argument('--api-key', default=os.environ.get('OPENAI_API_KEY'), help='OpenAI key for --record')
+    parser.add_argument('--warm', action='store_true', help='keep the result and menu caches between messages')
+    parser.add_argument('--no-tracemalloc', action='store_true', help='skip the allocation tracking overhead')
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args()
+
+    models = []
+    recorder = None
+    translator = None
+    if args.record:
+        if not args.api_key:
+            parser.error('--record needs --api-key or OPENAI_API_KEY')
+        api_key = args.api_key
+        recorder = fakes.Recorder()
+
+        def recording_factory(key, model):
+            chat_model = clients.create_chat_model(key, model)
+            chat_model.callbacks = [recorder]
+            return chat_model
+        clients.set_model_factory(recording_factory)
+    else:
+        api_key = 'benchmark'
+        cassette = None
+        if args.replay:
+            with open(args.replay, encoding='utf-8') as f:
+                cassette = json.load(f)
+        fast_model = {'failure_rate': args.fast_model_failure_rate}
+        if args.fast_model_latency is not None:
+            fast_model['latency'] = args.fast_model_latency
+        if args.fast_model_seconds_per_token is not None:
+            fast_model['seconds_per_token'] = args.fast_model_seconds_per_token
+        labels = dishes = None
+        if args.realistic:
+            labels = load_corpus(args.corpus)
+            with open(args.dishes, encoding='utf-8') as f:
+                dishes = json.load(f)
+        clients.set_model_factory(fakes.fake_model_factory(args.model_latency, args.seconds_per_token, cassette,
+                                                           models, {functions.FAST_MODEL: fast_model}, labels, dishes))
+        translator = fakes.FakeTranslator(args.translator_latency)
+        translation.set_translator(translator)
+    for stage in STAGES:
+        setattr(functions, stage, timed(stage, getattr(functions, stage)))
+    # The glossary seeding of the translation memory happens once per process, not per request
+    translation_memory.get_memory()
+
+    corpus = load_corpus(args.corpus)
+    messages = []
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+    started = time.perf_counter()
+    for entry in corpus:
+        if not args.warm:
+            clear_caches()
+        if not args.no_tracemalloc:
+            tracemalloc.reset_peak()
+            allocated_before = tracemalloc.get_traced_memory()[0]
+        message_started = time.perf_counter()
+        result = run_message(entry, args, api_key)
+        row = {'message': entry['message'][:60], 'language': entry.get('language', 'English'),
+               'seconds': time.perf_counter() - message_started,
+               'menus': len(result['menus']) if isinstance(result, dict) else 0,
+               'escalated': bool(metrics.history()[-1].get('escalations'))}
+        if not args.no_tracemalloc:
+            current, peak = tracemalloc.get_traced_memory()
+            row['allocated_bytes'] = current - allocated_before
+            row['peak_bytes'] = peak - allocated_before
+        messages.append(row)
+        print(f"{row['seconds']:7.2f} s {row['menus']} menus  {row['message']}")
+    total_seconds = time.perf_counter() - started
+    if not args.no_tracemalloc:
+        tracemalloc.stop()
+
+    if recorder is not None:
+        model_counters = recorder.counters
+        with open(args.record, 'w', encoding='utf-8') as f:
+            json.dump(recorder.cassette, f, ensure_ascii=False)
+    else:
+        model_counters = {}
+        for model in models:
+            counters = model_counters.setdefault(model.model_name, dict.fromkeys(model.counters, 0))
+            for name, value in model.counters.items():
+                counters[name] += value
+    results = {
+        'config': {name: value for name, value in vars(args).items() if name != 'api_key'},
+        'total_seconds': total_seconds,
+        'messages': messages,
+        'message_seconds': summary([row['seconds'] for row in messages]),
+        'stages': {stage: summary(values) for stage, values in stage_times.items()},
+        'models': model_counters,
+        'translation': {'calls': translator.calls if translator else translation.network_calls,
+                        'characters': translator.characters if translator else None,
+                        'memory': translation_memory.get_memory().stats()},
+        'parse': functions.parse_stats,
+        'prompts': prompts.report(),
+        'compact_output': dict(compact_menu.output_stats),
+        'singleflight': singleflight.stats(),
+        'escalation_rate': metrics.aggregate()['escalation_rate'],
+    }
+    for stage, values in results['stages'].items():
+        print(f"{stage:<26} {values['calls']:4d} calls {values['mean']:7.2f} s mean {values['p95']:7.2f} s p95")
+    for model, counters in model_counters.items():
+        print(f"{model:<26} {counters['calls']:4d} calls {counters['prompt_tokens']:7d} prompt "
+              f"{counters['completion_tokens']:7d} completion tokens")
+    print(f"translation {results['translation']['calls']} calls, total {total_seconds:.2f} s "
+          f"for {len(messages)} messages")
+    if results['escalation_rate'] is not None:
+        print(f"fast mode escalated {results['escalation_rate']:.0%} of the requests to {functions.MENU_MODEL}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Import cost of the Streamlit app at startup.
+
+Every module is imported in a fresh interpreter with ``-X importtime`` and its cumulative import time is reported.
+The app's eager imports before the deferred loading (everything main.py used to import at module top) are
+compared with the imports main.py does at module top now.
+
+    python benchmarks/startup.py [--repeat 5] [--json startup.json]
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ['streamlit', 'openai', 'langchain_openai', 'googletrans', 'reportlab.platypus', 'tiktoken',
+           'diets', 'translation', 'pdf_generator', 'functions']
+# What main.py imported at module top before the heavy imports were deferred
+EAGER_IMPORTS = ['streamlit', 'openai', 'functions', 'pdf_generator', 'time']
+
+
+def run_importtime(modules):
+    # (cumulative microseconds, indented module name) for every import of one fresh interpreter
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {', '.join(modules)}"],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and 'cumulative' not in line:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            rows.append((int(cumulative), name[1:]))
+    return rows
+
+
+def import_time(module, repeat):
+    # Best of `repeat` runs of the cumulative import time of one module
+    return min(dict((name.strip(), cumulative) for cumulative, name in run_importtime([module])).get(module, 0)
+               for _ in range(repeat))
+
+
+def top_level_imports(path):
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return modules
+
+
+def total_import_time(modules, repeat):
+    # Best of `repeat` runs of the summed cumulative time of the outermost imports when importing all modules
+    return min(sum(cumulative for cumulative, name in run_importtime(modules) if not name.startswith(' '))
+               for _ in range(repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args()
+
+    per_module = {module: import_time(module, args.repeat) for module in MODULES}
+    deferred_imports = top_level_imports(os.path.join(ROOT, 'main.py'))
+    results = {
+        'per_module_us': per_module,
+        'eager_imports': EAGER_IMPORTS,
+        'eager_us': total_import_time(EAGER_IMPORTS, args.repeat),
+        'deferred_imports': deferred_imports,
+        'deferred_us': total_import_time(deferred_imports, args.repeat),
+    }
+
+    for module, microseconds in per_module.items():
+        print(f"{module:<20} {microseconds / 1000:8.1f} ms")
+    print(f"main.py before ({', '.join(EAGER_IMPORTS)}): {results['eager_us'] / 1000:.1f} ms")
+    print(f"main.py now ({', '.join(deferred_imports)}): {results['deferred_us'] / 1000:.1f} ms")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
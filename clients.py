@@ -0,0 +1,106 @@
+from typing import Callable, Optional
+from collections import OrderedDict
+import asyncio
+import contextvars
+import hashlib
+import threading
+import time
+import httpx
+from langchain_openai import ChatOpenAI
+
+MAX_MODELS = 64
+MODEL_IDLE_SECONDS = 30 * 60
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=120)
+TIMEOUT = httpx.Timeout(600, connect=10)
+
+# Reentrant, the model factory gets the shared HTTP clients while the registry holds it
+_lock = threading.RLock()
+_models = OrderedDict()
+_http_client = None
+_http_async_client = None
+_loop = None
+# Builds the chat model for (api key, model name), replaced by the offline benchmarks with fake models
+_model_factory = None
+
+
+def get_http_client() -> httpx.Client:
+    # One keep-alive pool for every key and model, the API key is sent per request by the OpenAI client
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(limits=POOL_LIMITS, timeout=TIMEOUT)
+    return _http_client
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    # Async calls run on one long-lived loop, so the shared async pool is never bound to a closed loop
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='llm-client-loop', daemon=True).start()
+    return _loop
+
+
+def get_http_async_client() -> httpx.AsyncClient:
+    global _http_async_client
+    with _lock:
+        if _http_async_client is None:
+            _http_async_client = httpx.AsyncClient(limits=POOL_LIMITS, timeout=TIMEOUT)
+    return _http_async_client
+
+
+def run_async(coroutine):
+    # Runs a coroutine that uses the shared async clients from sync code and waits for its result.
+    # The caller's context variables (the request metrics) are carried over to the loop's task.
+    context = contextvars.copy_context()
+
+    async def in_context():
+        for variable, value in context.items():
+            variable.set(value)
+        return await coroutine
+    return asyncio.run_coroutine_threadsafe(in_context(), get_event_loop()).result()
+
+
+def create_chat_model(api_key: str, model: str) -> ChatOpenAI:
+    # The scheduler retries rate limits and transient errors, the OpenAI client itself doesn't
+    return ChatOpenAI(openai_api_key=api_key, model=model, temperature=0, max_retries=0,
+                      http_client=get_http_client(), http_async_client=get_http_async_client())
+
+
+def set_model_factory(factory: Optional[Callable[[str, str], ChatOpenAI]]):
+    # None restores create_chat_model, models built by the previous factory are dropped
+    global _model_factory
+    with _lock:
+        _model_factory = factory
+        _models.clear()
+
+
+def api_key_hash(api_key: str) -> str:
+    # Identifies an API key in registry and coalescing keys without keeping the key itself
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def model_key_hash(chat_model) -> str:
+    # api_key_hash of the key a chat model calls with, the scheduler's rate limits are per key
+    api_key = getattr(chat_model, 'openai_api_key', None)
+    return api_key_hash(api_key.get_secret_value() if api_key is not None else '')
+
+
+def get_chat_model(api_key: str, model: str) -> ChatOpenAI:
+    # Registry of ChatOpenAI objects keyed by (api key hash, model), bounded and evicting idle entries
+    key = (api_key_hash(api_key), model)
+    now = time.monotonic()
+    with _lock:
+        for stale_key in [k for k, (used, _) in _models.items() if now - used > MODEL_IDLE_SECONDS]:
+            del _models[stale_key]
+        entry = _models.get(key)
+        if entry is None:
+            chat_model = (_model_factory or create_chat_model)(api_key, model)
+        else:
+            chat_model = entry[1]
+        _models[key] = (now, chat_model)
+        _models.move_to_end(key)
+        while len(_models) > MAX_MODELS:
+            _models.popitem(last=False)
+    return chat_model
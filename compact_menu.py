@@ -0,0 +1,79 @@
+from typing import Dict, List
+import logging
+import threading
+from langchain_core.pydantic_v1 import BaseModel, Field
+import prompts
+
+logger = logging.getLogger(__name__)
+
+
+# Generation schema with short keys and without the fields that can be computed locally
+# (meal numbers, meal and day totals, number of meals, currency)
+class CompactDish(BaseModel):
+    n: str = Field(description="Name of the dish")
+    i: List[str] = Field(description="Ingredients")
+    c: str = Field(description="Cooking instructions")
+    p: float = Field(description="Approximate price")
+
+
+class CompactMeal(BaseModel):
+    d: str = Field(description="Meal description, e.g. Breakfast")
+    ds: List[CompactDish] = Field(description="Dishes")
+
+
+class CompactMenu(BaseModel):
+    m: List[CompactMeal] = Field(description="Meals of the day")
+
+
+class CompactMenuList(BaseModel):
+    ms: List[CompactMenu] = Field(description="Daily menu options")
+
+
+# Responses, output tokens of the compact form and of the same menus in the full DailyMenuList form
+output_stats = {'responses': 0, 'compact_tokens': 0, 'full_tokens': 0}
+_stats_lock = threading.Lock()
+
+
+def expand_dish(dish: Dict) -> Dict:
+    return {
+        'name': dish.get('n', ''),
+        'ingredients': dish.get('i') or [],
+        'cooking_instructions': dish.get('c', ''),
+        'price': float(dish.get('p') or 0),
+    }
+
+
+def expand_meal(meal: Dict, meal_number: int) -> Dict:
+    dishes = [expand_dish(dish) for dish in meal.get('ds') or []]
+    return {
+        'meal_number': meal_number,
+        'description': meal.get('d', ''),
+        'dishes': dishes,
+        'total_price': round(sum(dish['price'] for dish in dishes), 2),
+    }
+
+
+def expand_menu(menu: Dict, currency: str = 'UAH') -> Dict:
+    meals = [expand_meal(meal, i + 1) for i, meal in enumerate(menu.get('m') or [])]
+    return {
+        'meals': meals,
+        'meals_number': len(meals),
+        'total_price': round(sum(meal['total_price'] for meal in meals), 2),
+        'currency': currency,
+    }
+
+
+def expand_menu_list(menu_list: Dict, currency: str = 'UAH') -> Dict:
+    return {'menus': [expand_menu(menu, currency) for menu in menu_list.get('ms') or []]}
+
+
+def record_reduction(compact_output, full_output, model_name: str):
+    compact_tokens = prompts.count_tokens(prompts.compact(compact_output), model_name)
+    full_tokens = prompts.count_tokens(prompts.compact(full_output), model_name)
+    with _stats_lock:
+        output_stats['responses'] += 1
+        output_stats['compact_tokens'] += compact_tokens
+        output_stats['full_tokens'] += full_tokens
+    if full_tokens:
+        logger.info("Compact menu schema: %d output tokens instead of %d (%.0f%% fewer)",
+                    compact_tokens, full_tokens, 100 * (1 - compact_tokens / full_tokens))
@@ -1,14 +1,52 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
+import asyncio
+import json
+import threading
+import time
 from langchain.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.pydantic_v1 import BaseModel, Field
 from langchain_openai import ChatOpenAI
 from langchain.output_parsers import OutputFixingParser
 from langchain.schema import OutputParserException
-import googletrans
+from langchain_core.utils.function_calling import convert_to_openai_tool
+import logging
+import os
+import clients
+import compact_menu
+import prompts
+import translation
+import indication_index
+import menu_checks
+import metrics
+import result_cache
+import scheduler
+import singleflight
 import diets
 import streamlit as st
 
+logger = logging.getLogger(__name__)
+
+FAST_MODEL = "gpt-3.5-turbo-0125"
+MENU_MODEL = "gpt-4-0125-preview"
+# Label of the Ukrainian option of the language selector, main and main_stream compare with it
+UKRAINIAN_LANGUAGE = "Ukrainian ***:red[beta]***"
+# Plain language names accepted by the headless entry points, mapped onto the selector labels
+LANGUAGES = {'English': 'English', 'Ukrainian': UKRAINIAN_LANGUAGE}
+# Use the provider's function calling with schemas built from the pydantic models instead of parsing free text
+STRUCTURED_OUTPUT = os.environ.get('DIET_BOT_STRUCTURED_OUTPUT', '1') == '1'
+# Generate menus in the short-key compact_menu schema and compute the derivable fields locally
+COMPACT_SCHEMA = os.environ.get('DIET_BOT_COMPACT_SCHEMA', '1') == '1'
+# Default of the fast mode: menus come from FAST_MODEL and only go to MENU_MODEL when the local checks fail
+FAST_MODE = os.environ.get('DIET_BOT_FAST_MODE', '0') == '1'
+# Menu options per request and meals per menu asked for in the prompt, the fast mode checks them
+MENUS_NUMBER = 3
+MEALS_NUMBER = 5
+
+# Calls, parse failures and OutputFixingParser repair calls per stage
+parse_stats = {}
+_parse_stats_lock = threading.Lock()
+
 
 # Define your models
 class UserInfo(BaseModel):
@@ -24,6 +62,11 @@ class Indication(BaseModel):
     explanation: str = Field(description="Why you think so?")
 
 
+class RequestInfo(UserInfo):
+    is_valid: bool = Field(description="Whether the message is an adequate description of the user's health.")
+    indication_index: Optional[int] = Field(description="Index of similar indications.")
+
+
 class Dish(BaseModel):
     name: str = Field(description="Name of the dish")
     ingredients: List[str] = Field(description="List of ingredients for the dish")
@@ -51,35 +94,136 @@ class DailyMenuList(BaseModel):
 
 # Define your functions
 def get_model(api_key, model) -> ChatOpenAI:
-    return ChatOpenAI(openai_api_key=api_key, model=model, temperature=0)
+    return clients.get_chat_model(api_key, model)
 
 
-def get_user_info(user_message: str, model: ChatOpenAI) -> UserInfo:
-    query = (
-        "You are a specialist in processing requests from a user who describes information about himself for the "
-        "purpose of assigning him a therapeutic diet."
-        "But there are cases when the user's message is incorrect or contains false information, so first check "
-        "whether the user's message is an adequate description of information about: "
-        "the user's health problems, his allergies, intolerances, "
-        "wishes, what to exclude and what to add, type of diet and other restrictions. "
-        "If the user's message is inadequate, contains many grammatical, lexical, "
-        "semantic errors, errors in medical terms, non-existent medical terms or invented made-up diseases, "
-        "humorous diseases then fill all fields as None."
-        f"If the user's message is correct, extract the relevant information from the message. User message: '{user_message}'"
-    )
-    parser = JsonOutputParser(pydantic_object=UserInfo)
+def count_parse(stage: str, *counters: str) -> Dict:
+    # Returns a copy of the stage's counters after the increments
+    with _parse_stats_lock:
+        stats = parse_stats.setdefault(stage, {'calls': 0, 'parse_failures': 0, 'repair_calls': 0})
+        for counter in counters:
+            stats[counter] += 1
+        return dict(stats)
+
+
+def stage_chains(query: str, pydantic_object, model: ChatOpenAI):
+    # Returns (chain, parser). In structured mode the provider fills a function schema built from the
+    # pydantic model, so the prompt needs no format instructions and the output is valid by construction.
+    parser = JsonOutputParser(pydantic_object=pydantic_object)
+    if STRUCTURED_OUTPUT:
+        chain = model.with_structured_output(convert_to_openai_tool(pydantic_object), include_raw=True)
+        return chain, parser
     prompt = PromptTemplate(
         template="Answer the user query.\n{format_instructions}\n{query}\n",
         input_variables=["query"],
         partial_variables={"format_instructions": parser.get_format_instructions()},
     )
-    chain = prompt | model
-    output = chain.invoke({"query": query})
+    return prompt | model, parser
+
+
+def structured_text(output) -> Optional[str]:
+    # The parsed arguments of a structured call, or the raw text to repair when they could not be parsed
+    if output['parsing_error'] is None and output['parsed'] is not None:
+        return None
+    tool_calls = output['raw'].additional_kwargs.get('tool_calls') or []
+    return tool_calls[0]['function']['arguments'] if tool_calls else output['raw'].content
+
+
+def response_message(output):
+    return output['raw'] if STRUCTURED_OUTPUT else output
+
+
+def response_usage(output) -> Optional[Dict]:
+    return (getattr(response_message(output), 'response_metadata', None) or {}).get('token_usage')
+
+
+def prepare_stage(stage: str, query: str, pydantic_object, model: ChatOpenAI):
+    # Returns (chain, parser, model name, prompt tokens, chain input) for invoke_stage and ainvoke_stage
+    count_parse(stage, 'calls')
+    chain, parser = stage_chains(query, pydantic_object, model)
+    model_name = getattr(model, 'model_name', '')
+    prompt_tokens = prompts.measure(stage, query, model_name)
+    return chain, parser, model_name, prompt_tokens, query if STRUCTURED_OUTPUT else {"query": query}
+
+
+def parse_stage_output(stage: str, output, parser, model_name: str):
+    # Records the usage of the stage call and returns (parsed output, None), or (None, text) when the text
+    # could not be parsed and needs a repair call
+    usage = prompts.record_usage(stage, response_message(output))
+    metrics.record_tokens(model_name, usage)
+    if STRUCTURED_OUTPUT:
+        text = structured_text(output)
+        if text is None:
+            return output['parsed'], None
+    else:
+        text = output.content
     try:
-        parsed_output = parser.parse(output.content)
-    except OutputParserException as e:
-        fix_parser = OutputFixingParser.from_llm(parser=parser, llm=model)
-        parsed_output = fix_parser.parse(output.content)
+        return parser.parse(text), None
+    except OutputParserException:
+        stats = count_parse(stage, 'parse_failures', 'repair_calls')
+        logger.warning("Stage %s output could not be parsed, repairing it with another call: %s", stage, stats)
+        metrics.count('repair_calls')
+        return None, text
+
+
+def invoke_stage(stage: str, query: str, pydantic_object, model: ChatOpenAI):
+    chain, parser, model_name, prompt_tokens, chain_input = prepare_stage(stage, query, pydantic_object, model)
+    key_hash = clients.model_key_hash(model)
+    # Admitted by the rate-limit scheduler, which also retries rate limits and transient errors
+    with metrics.stage(stage):
+        output = scheduler.call(key_hash, model_name, stage, prompt_tokens, lambda: chain.invoke(chain_input),
+                                usage=response_usage)
+    parsed, text = parse_stage_output(stage, output, parser, model_name)
+    if text is None:
+        return parsed
+    fix_parser = OutputFixingParser.from_llm(parser=parser, llm=model)
+    with metrics.stage(f'{stage}_repair'):
+        return scheduler.call(key_hash, model_name, f'{stage}_repair', prompts.count_tokens(text, model_name),
+                              lambda: fix_parser.parse(text))
+
+
+async def ainvoke_stage(stage: str, query: str, pydantic_object, model: ChatOpenAI):
+    chain, parser, model_name, prompt_tokens, chain_input = prepare_stage(stage, query, pydantic_object, model)
+    key_hash = clients.model_key_hash(model)
+    with metrics.stage(stage):
+        output = await scheduler.acall(key_hash, model_name, stage, prompt_tokens,
+                                       lambda: chain.ainvoke(chain_input), usage=response_usage)
+    parsed, text = parse_stage_output(stage, output, parser, model_name)
+    if text is None:
+        return parsed
+    fix_parser = OutputFixingParser.from_llm(parser=parser, llm=model)
+    with metrics.stage(f'{stage}_repair'):
+        return await scheduler.acall(key_hash, model_name, f'{stage}_repair',
+                                     prompts.count_tokens(text, model_name), lambda: fix_parser.aparse(text))
+
+
+USER_INFO_INSTRUCTIONS = (
+    "You are a specialist in processing requests from a user who describes information about himself for the "
+    "purpose of assigning him a therapeutic diet."
+    "But there are cases when the user's message is incorrect or contains false information, so first check "
+    "whether the user's message is an adequate description of information about: "
+    "the user's health problems, his allergies, intolerances, "
+    "wishes, what to exclude and what to add, type of diet and other restrictions. "
+    "If the user's message is inadequate, contains many grammatical, lexical, "
+    "semantic errors, errors in medical terms, non-existent medical terms or invented made-up diseases, "
+)
+
+INDICATION_INSTRUCTIONS = (
+    "Write the diet number from the 'List of medical indications' that best describes and corresponds to "
+    "the user's health indications, keep in mind that some lines are similar, but you should choose the one that "
+    "is as similar in meaning as possible. If you did not find an exact match in the 'List of medical indications', "
+    "then return indication_index None."
+)
+
+
+@singleflight.coalesced('user_info')
+def get_user_info(user_message: str, model: ChatOpenAI) -> UserInfo:
+    query = prompts.build(
+        [USER_INFO_INSTRUCTIONS + "humorous diseases then fill all fields as None. If the user's message is correct, "
+                                  "extract the relevant information from the message."],
+        [f"User message: '{user_message}'"],
+    )
+    parsed_output = invoke_stage('user_info', query, UserInfo, model)
 
     # Handling an invalid user request
     if parsed_output['health_info'] == 'None' or parsed_output['health_info'] is None:
@@ -88,110 +232,443 @@ def get_user_info(user_message: str, model: ChatOpenAI) -> UserInfo:
     return parsed_output
 
 
+@singleflight.coalesced('indication')
 def get_indication_info(user_info: UserInfo, indications_list: List[tuple], model: ChatOpenAI) -> Indication:
-    query = (
-        f"'List of medical indications': {indications_list}. "
-        "You are a specialist in determining the appropriateness of user information and available medical indications."
-        f"Write the diet number that best describes and corresponds to the user’s health indications, keep in mind "
-        f"that some lines are similar, but you should choose the one that is as similar in meaning as possible: user_info ='{user_info['health_info']}'. "
-        "If you did not find an exact match in the 'List of medical indications', then return indication_index None."
-    )
-    parser = JsonOutputParser(pydantic_object=Indication)
-    prompt = PromptTemplate(
-        template="Answer the user query.\n{format_instructions}\n{query}\n",
-        input_variables=["query"],
-        partial_variables={"format_instructions": parser.get_format_instructions()},
+    query = prompts.build(
+        ["You are a specialist in determining the appropriateness of user information and available medical "
+         "indications. " + INDICATION_INSTRUCTIONS,
+         "List of medical indications:\n" + prompts.compact_indications(indications_list)],
+        [f"User's health indications: '{user_info['health_info']}'"],
     )
-    chain = prompt | model
-    output = chain.invoke({"query": query})
-    try:
-        parsed_output = parser.parse(output.content)
-    except OutputParserException as e:
-        fix_parser = OutputFixingParser.from_llm(parser=parser, llm=model)
-        parsed_output = fix_parser.parse(output.content)
+    parsed_output = invoke_stage('indication', query, Indication, model)
     return parsed_output
 
 
-def get_diet_options(temp: Dict, user_info: UserInfo, model: ChatOpenAI) -> DailyMenuList:
-    query = (
-        f"{temp} \n"
-        "You are a dietary cook, your work is very important, so do it responsibly and carefully, "
-        "do not invent non-existent dishes and follow dietary recommendations. "
-        f"Taking into account the dietary recommendations of '{temp['diet_name']}', "
-        f"create for me a list of {3} balanced daily menu options. "
-        f"Each daily menu on your list should consist of {5} meals."
-        f"Each daily menu dish on your list should not contain products that may cause allergies: '{user_info['allergies']}' and intolerances: '{user_info['intolerances']}'."
-        f"User is currently located in the country {'Ukraine'}. Please indicate prices for food products in {'UAH'}."
+@singleflight.coalesced('request_info')
+def get_request_info(user_message: str, indications_list: List[tuple], model: ChatOpenAI) -> RequestInfo:
+    # Extracts the user info and chooses the diet index in one call instead of get_user_info + get_indication_info
+    query = prompts.build(
+        [USER_INFO_INSTRUCTIONS + "humorous diseases then set is_valid to false and fill all other fields as None. "
+                                  "If the user's message is correct, set is_valid to true and extract the relevant "
+                                  "information from the message. Then: " + INDICATION_INSTRUCTIONS,
+         "List of medical indications:\n" + prompts.compact_indications(indications_list)],
+        [f"User message: '{user_message}'"],
     )
+    parsed_output = invoke_stage('request_info', query, RequestInfo, model)
+
+    # Handling an invalid user request
+    if (not parsed_output.get('is_valid', True) or parsed_output.get('health_info') == 'None'
+            or parsed_output.get('health_info') is None):
+        return 'Incorrect request'
+
+    return parsed_output
 
+
+# Hints that keep independently generated menu options from duplicating each other
+DIVERSITY_HINTS = [
+    "build this menu mostly around poultry, dairy products and cereals",
+    "build this menu mostly around fish, vegetables and potatoes",
+    "build this menu mostly around lean meat, eggs, fruits and berries",
+]
+
+DIET_COOK_INSTRUCTIONS = (
+    "You are a dietary cook, your work is very important, so do it responsibly and carefully, "
+    "do not invent non-existent dishes and follow dietary recommendations. "
+    f"User is currently located in the country {'Ukraine'}. Please indicate prices for food products in {'UAH'}."
+)
+
+
+def diet_options_query(temp: Dict, user_info: UserInfo, hint: Optional[str] = None,
+                       output_language: str = 'English') -> str:
+    if hint is None:
+        task = (f"Create for me a list of {MENUS_NUMBER} balanced daily menu options. "
+                f"Each daily menu on your list should consist of {MEALS_NUMBER} meals. ")
+    else:
+        task = (f"Create for me one balanced daily menu of {MEALS_NUMBER} meals. "
+                f"To make it differ from other options, {hint}, as far as the diet allows. ")
+    conditions = (f"Each daily menu dish on your list should not contain products that may cause allergies: "
+                  f"'{user_info['allergies']}' and intolerances: '{user_info['intolerances']}'. ")
     if user_info['exclude'] or user_info['add']:
-        query += (f"Please note as additional conditions from the client that the menu should not contain products "
-                  f"such as: {user_info['exclude']}, but on the contrary, be sure to add products: {user_info['add']}. ")
+        conditions += (f"Please note as additional conditions from the client that the menu should not contain "
+                       f"products such as: {user_info['exclude']}, but on the contrary, be sure to add products: "
+                       f"{user_info['add']}. ")
+    if output_language != 'English':
+        conditions += (f"Write all values (meal descriptions, dish names, ingredients, cooking instructions, "
+                       f"currency) in {output_language}, use the traditional {output_language} names of the dishes. "
+                       f"Keep the JSON keys in English. ")
+    return prompts.build(
+        [DIET_COOK_INSTRUCTIONS,
+         f"Dietary recommendations of '{temp['diet_name']}': {prompts.compact(temp)}"],
+        [task + conditions],
+    )
+
+
+def menu_currency(output_language: str) -> str:
+    return 'грн' if output_language == 'Ukrainian' else 'UAH'
+
+
+@singleflight.coalesced('diet_options')
+def get_diet_options(temp: Dict, user_info: UserInfo, model: ChatOpenAI,
+                     output_language: str = 'English') -> DailyMenuList:
+    query = diet_options_query(temp, user_info, output_language=output_language)
+    if COMPACT_SCHEMA:
+        compact_output = invoke_stage('diet_options', query, compact_menu.CompactMenuList, model)
+        parsed_output = compact_menu.expand_menu_list(compact_output, menu_currency(output_language))
+        compact_menu.record_reduction(compact_output, parsed_output, getattr(model, 'model_name', ''))
+        return parsed_output
+    parsed_output = invoke_stage('diet_options', query, DailyMenuList, model)
+    return parsed_output
+
+
+async def aget_diet_option(temp: Dict, user_info: UserInfo, model: ChatOpenAI, hint: str,
+                           output_language: str = 'English') -> DailyMenu:
+    query = diet_options_query(temp, user_info, hint, output_language)
+    if COMPACT_SCHEMA:
+        compact_output = await ainvoke_stage('diet_option', query, compact_menu.CompactMenu, model)
+        parsed_output = compact_menu.expand_menu(compact_output, menu_currency(output_language))
+        compact_menu.record_reduction(compact_output, parsed_output, getattr(model, 'model_name', ''))
+        return parsed_output
+    parsed_output = await ainvoke_stage('diet_option', query, DailyMenu, model)
+    return parsed_output
+
+
+async def aget_diet_options_parallel(temp: Dict, user_info: UserInfo, model: ChatOpenAI,
+                                     output_language: str = 'English',
+                                     indices: Optional[List[int]] = None) -> DailyMenuList:
+    # One request per menu option, so the latency is set by the slowest menu instead of the sum of all.
+    # indices picks the options (by their diversity hint) to generate, all of them by default.
+    hints = DIVERSITY_HINTS if indices is None else [DIVERSITY_HINTS[i] for i in indices]
+    menus = await asyncio.gather(*(aget_diet_option(temp, user_info, model, hint, output_language)
+                                   for hint in hints))
+    return {'menus': list(menus)}
+
 
-    parser = JsonOutputParser(pydantic_object=DailyMenuList)
+@singleflight.coalesced('diet_options_parallel')
+def get_diet_options_parallel(temp: Dict, user_info: UserInfo, model: ChatOpenAI,
+                              output_language: str = 'English') -> DailyMenuList:
+    return clients.run_async(aget_diet_options_parallel(temp, user_info, model, output_language))
+
+
+def get_diet_options_fast(temp: Dict, user_info: UserInfo, model_3_5: ChatOpenAI, model_4: ChatOpenAI,
+                          output_language: str = 'English', mode: str = 'single') -> DailyMenuList:
+    # Model cascade: the menus of the fast model are kept when they pass the local checks (schema, number of
+    # menus and meals, allergies, intolerances, exclusions and the diet's excluded foods), otherwise they are
+    # generated again by the menu model. In parallel mode only the menus that failed are generated again.
+    try:
+        if mode == 'parallel':
+            diet_options = get_diet_options_parallel(temp, user_info, model_3_5, output_language)
+        else:
+            diet_options = get_diet_options(temp, user_info, model_3_5, output_language)
+        problems = menu_checks.check_menus(diet_options, DailyMenuList, temp, user_info, MENUS_NUMBER,
+                                           MEALS_NUMBER)
+    except OutputParserException as e:
+        diet_options, problems = None, [(None, f"unparsable output: {e}")]
+    if not problems:
+        return diet_options
+    failed = {index for index, problem in problems}
+    logger.info("Fast model menus failed %d checks, escalating to %s: %s", len(problems), MENU_MODEL,
+                '; '.join(problem for index, problem in problems[:5]))
+    metrics.count('escalations')
+    if mode == 'parallel' and None not in failed:
+        metrics.count('escalated_menus', len(failed))
+        menus = list(diet_options['menus'])
+        escalated = clients.run_async(aget_diet_options_parallel(temp, user_info, model_4, output_language,
+                                                                 sorted(failed)))
+        for i, menu in zip(sorted(failed), escalated['menus']):
+            menus[i] = menu
+        return {'menus': menus}
+    metrics.count('escalated_menus', MENUS_NUMBER)
+    if mode == 'parallel':
+        return get_diet_options_parallel(temp, user_info, model_4, output_language)
+    return get_diet_options(temp, user_info, model_4, output_language)
+
+
+def stream_diet_options(temp: Dict, user_info: UserInfo, model: ChatOpenAI,
+                        output_language: str = 'English') -> Iterator[tuple]:
+    # Yields ('meal', (menu_index, meal_index), meal) and ('menu', menu_index, menu) events as soon as
+    # the incrementally parsed JSON shows that an item is complete (the next sibling has started).
+    # With the compact schema every item is expanded to the DailyMenuList form before it is yielded.
+    query = diet_options_query(temp, user_info, output_language=output_language)
+    currency = menu_currency(output_language)
+    if COMPACT_SCHEMA:
+        parser = JsonOutputParser(pydantic_object=compact_menu.CompactMenuList)
+        menus_key, meals_key = 'ms', 'm'
+        expand_meal = lambda meal, number: compact_menu.expand_meal(meal, number)
+        expand_menu = lambda menu: compact_menu.expand_menu(menu, currency)
+    else:
+        parser = JsonOutputParser(pydantic_object=DailyMenuList)
+        menus_key, meals_key = 'menus', 'meals'
+        expand_meal = lambda meal, number: meal
+        expand_menu = lambda menu: menu
     prompt = PromptTemplate(
         template="Answer the user query.\n{format_instructions}\n{query}\n",
         input_variables=["query"],
         partial_variables={"format_instructions": parser.get_format_instructions()},
     )
-    chain = prompt | model
-    output = chain.invoke({"query": query})
-    try:
-        parsed_output = parser.parse(output.content)
-    except OutputParserException as e:
-        fix_parser = OutputFixingParser.from_llm(parser=parser, llm=model)
-        parsed_output = fix_parser.parse(output.content)
-    return parsed_output
+    chain = prompt | model | parser
+    menus = []
+    menus_done = 0
+    meals_done = 0
+    prompt_tokens = prompts.measure('diet_options', query, getattr(model, 'model_name', ''))
+    stream_started = time.perf_counter()
+    for partial in scheduler.stream(clients.model_key_hash(model), getattr(model, 'model_name', ''), 'diet_options',
+                                    prompt_tokens, lambda: chain.stream({"query": query})):
+        menus = partial.get(menus_key) or [] if isinstance(partial, dict) else []
+        while menus_done < len(menus):
+            meals = menus[menus_done].get(meals_key) or [] if isinstance(menus[menus_done], dict) else []
+            menu_complete = menus_done + 1 < len(menus)
+            while meals_done + 1 < len(meals) or (menu_complete and meals_done < len(meals)):
+                yield 'meal', (menus_done, meals_done), expand_meal(meals[meals_done], meals_done + 1)
+                meals_done += 1
+            if not menu_complete:
+                break
+            yield 'menu', menus_done, expand_menu(menus[menus_done])
+            menus_done += 1
+            meals_done = 0
+
+    # Streamed responses carry no usage, the completion is counted locally. The stage ends with the stream,
+    # it includes the time the consumer spent between the events.
+    metrics.add_stage('diet_options', stream_started, time.perf_counter())
+    metrics.record_tokens(getattr(model, 'model_name', ''), {
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': prompts.count_tokens(json.dumps(partial, ensure_ascii=False) if menus else '',
+                                                  getattr(model, 'model_name', '')),
+    }, estimated=True)
+    if not menus:
+        # The stream could not be parsed at all, fall back to the regular call with output fixing
+        for i, menu in enumerate(get_diet_options(temp, user_info, model, output_language)['menus']):
+            for j, meal in enumerate(menu['meals']):
+                yield 'meal', (i, j), meal
+            yield 'menu', i, menu
+        return
+    for i in range(menus_done, len(menus)):
+        meals = menus[i].get(meals_key) or []
+        for j in range(meals_done, len(meals)):
+            yield 'meal', (i, j), expand_meal(meals[j], j + 1)
+        yield 'menu', i, expand_menu(menus[i])
+        meals_done = 0
+    if COMPACT_SCHEMA:
+        compact_menu.record_reduction(partial, {'menus': [expand_menu(menu) for menu in menus]},
+                                      getattr(model, 'model_name', ''))
 
 
 def translate_text(text: str, dest_language: str = 'uk') -> str:
-    translator = googletrans.Translator()
-    result = translator.translate(text, dest=dest_language)
-    return result.text
+    return translation.translate_batch([text], dest_language)[0]
 
 
 def translate_dict(data: dict, dest_language: str = 'uk') -> dict:
-    if isinstance(data, dict):
-        return {k: translate_dict(v, dest_language) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [translate_dict(item, dest_language) for item in data]
-    elif isinstance(data, str):
-        return translate_text(data, dest_language)
-    else:
-        return data
-
-
-def main(user_message, api_key, language):
-    # Main code
-    model_3_5 = get_model(api_key, "gpt-3.5-turbo-0125")
-    model_4 = get_model(api_key, "gpt-4-0125-preview")
-    diet_data_list = diets.get_diet_data_list()
-    diet_data_list_en = diets.get_diet_data_list_en()
-    user_info = get_user_info(user_message, model_3_5)
-    indications_list = [(i, diet['indications']) for i, diet in enumerate(diet_data_list_en)]
-    indications_list.append((99, "If it doesn't exactly match any other."))
-    if user_info != 'Incorrect request':
-        indication_info = get_indication_info(user_info, indications_list, model_3_5)
-        indication_index = int(indication_info['indication_index'])
-        if indication_index is not None:
-            temp = diet_data_list_en[indication_index].copy()
-            if 'indications' in temp:
-                temp.pop('indications')
-            if 'purpose' in temp:
-                temp.pop('purpose')
-            if 'eating_regime' in temp:
-                temp.pop('eating_regime')
+    return translation.translate_tree(data, dest_language)
+
+
+def get_diet_request(user_message: str, model: ChatOpenAI, native_ukrainian: bool = False, fused: bool = True):
+    # Returns (user_info, temp) for the menu generation stage or 'Incorrect request'.
+    # With native_ukrainian the request is matched against the Ukrainian diet corpus and temp is in Ukrainian.
+    # With fused the user info and the diet index come from a single get_request_info call.
+    store = diets.get_store()
+    language = 'uk' if native_ukrainian else 'en'
+    all_indications = store.indications(language)
+    if fused:
+        # The raw message is ranked locally to shorten the list when the match is clear
+        local_match = indication_index.match(user_message)
+        if local_match['confident']:
+            indications_list = [all_indications[i] for i in local_match['candidates']]
         else:
-            temp = user_info.copy()
-            temp['diet_name'] = f"General diet for '{user_info['health_info']}'"
-        diet_options = get_diet_options(temp, user_info, model_4)
-        if language == "Ukrainian ***:red[beta]***":
-            translated_diet_options = translate_dict(diet_options)
-            return translated_diet_options
+            indications_list = list(all_indications)
+        indications_list.append((99, "If it doesn't exactly match any other."))
+        request_info = get_request_info(user_message, indications_list, model)
+        if request_info == 'Incorrect request':
+            return 'Incorrect request'
+        user_info = {key: request_info.get(key) for key in UserInfo.__fields__}
+        indication_info = {'indication_index': request_info.get('indication_index')}
+    else:
+        user_info = get_user_info(user_message, model)
+        if user_info == 'Incorrect request':
+            return 'Incorrect request'
+        # The local index settles most requests, the LLM only chooses among its top candidates when it is unsure
+        local_match = indication_index.match(user_info['health_info'])
+        if local_match['confident']:
+            indication_info = {'indication_index': local_match['indication_index'],
+                               'explanation': 'Matched by the local indication index.'}
         else:
-            return diet_options
+            if local_match['candidates']:
+                indications_list = [all_indications[i] for i in local_match['candidates']]
+            else:
+                indications_list = list(all_indications)
+            indications_list.append((99, "If it doesn't exactly match any other."))
+            indication_info = get_indication_info(user_info, indications_list, model)
+    indication_index_value = indication_info.get('indication_index')
+    if indication_index_value is not None and 0 <= int(indication_index_value) < len(store):
+        # Shared precomputed view, it is only read by the prompt builder and the menu cache
+        temp = store.prompt_view(int(indication_index_value), language)
+    else:
+        temp = user_info.copy()
+        temp['diet_name'] = f"General diet for '{user_info['health_info']}'"
+    return user_info, temp
+
+
+def log_translation_saved():
+    if translation.average_tree_seconds is not None:
+        logger.info("Native Ukrainian generation saved about %.1f s of post-translation",
+                    translation.average_tree_seconds)
     else:
+        logger.info("Native Ukrainian generation skipped post-translation (no translate-after timing yet)")
+
+
+def get_cached_result(user_message, language, native, fast=False):
+    # Returns (cache key, cached result marked with 'cached': True or None)
+    cache = result_cache.get_result_cache()
+    options = {'native_ukrainian': native, 'fast': True} if fast else {'native_ukrainian': native}
+    key = cache.key(user_message, language, (FAST_MODEL, MENU_MODEL), options)
+    cached = cache.get(key)
+    return key, dict(cached, cached=True) if cached is not None else None
+
+
+def get_cached_menus(temp, user_info, output_language, fast=False):
+    # Second level cache: menus generated earlier for the same diet and the same normalised constraints.
+    # Fast mode menus are kept apart, they may come from the fast model.
+    cache = result_cache.get_menu_cache()
+    key = cache.key(temp['diet_name'], user_info, output_language, (FAST_MODEL, MENU_MODEL) if fast else (MENU_MODEL,))
+    return key, cache.get(key)
+
+
+def main(user_message, api_key, language, mode='single', native_ukrainian=False, fused=True, progress=None,
+         fast=FAST_MODE):
+    # Main code, mode is 'single' (one request for all menus) or 'parallel' (one request per menu).
+    # With native_ukrainian a Ukrainian menu is generated directly instead of being translated afterwards.
+    # With fast the menus go through the get_diet_options_fast cascade.
+    # progress, if given, is called with the name of every stage as it starts.
+    progress = progress or (lambda stage: None)
+    ukrainian = language == UKRAINIAN_LANGUAGE
+    native = ukrainian and native_ukrainian
+    with metrics.track_request(mode=mode, language='Ukrainian' if ukrainian else 'English', native=native,
+                               fused=fused, fast=fast) as request:
+        cache_key, cached = get_cached_result(user_message, language, native, fast)
+        if cached is not None:
+            request.fields['cached'] = True
+            return cached
+        # Identical requests in flight at the same time with the same API key share one run of the pipeline,
+        # a request never waits on (or fails with) the quota and errors of another user's key. Every caller's
+        # progress follows the stages of the shared run.
+        result = singleflight.do('pipeline', (clients.api_key_hash(api_key), cache_key), run_pipeline,
+                                 user_message, api_key, language, mode, native, fused, cache_key=cache_key,
+                                 fast=fast, progress=progress)
+        if result == 'Incorrect request':
+            request.fields['outcome'] = 'incorrect'
+        return result
+
+
+def run_pipeline(user_message, api_key, language, mode, native, fused, cache_key, fast=False, progress=None):
+    progress = progress or (lambda stage: None)
+    ukrainian = language == UKRAINIAN_LANGUAGE
+    output_language = 'Ukrainian' if native else 'English'
+    model_3_5 = get_model(api_key, FAST_MODEL)
+    model_4 = get_model(api_key, MENU_MODEL)
+    progress('Analysing the request')
+    diet_request = get_diet_request(user_message, model_3_5, native, fused)
+    if diet_request == 'Incorrect request':
         return 'Incorrect request'
+    user_info, temp = diet_request
+    progress('Generating menus')
+    menu_key, diet_options = get_cached_menus(temp, user_info, output_language, fast)
+    if diet_options is None:
+        if fast:
+            diet_options = get_diet_options_fast(temp, user_info, model_3_5, model_4, output_language, mode)
+        elif mode == 'parallel':
+            diet_options = get_diet_options_parallel(temp, user_info, model_4, output_language)
+        else:
+            diet_options = get_diet_options(temp, user_info, model_4, output_language)
+        result_cache.get_menu_cache().add(menu_key, diet_options)
+    if native:
+        log_translation_saved()
+    elif ukrainian:
+        progress('Translating menus')
+        diet_options = translate_dict(diet_options)
+    result_cache.get_result_cache().set(cache_key, diet_options)
+    return diet_options
+
+
+def main_stream(user_message, api_key, language, native_ukrainian=False, fused=True,
+                progress=None, fast=FAST_MODE) -> Iterator[tuple]:
+    # Streaming variant of main: yields the events of stream_diet_options and finishes with
+    # ('result', None, diet_options) or ('result', None, 'Incorrect request').
+    # For translated Ukrainian, menus are translated one by one as they complete and meal events are skipped.
+    # With fast the cascade can't be streamed, menus that could still be replaced are never shown: the menu
+    # events follow once the checked menus are ready.
+    progress = progress or (lambda stage: None)
+    ukrainian = language == UKRAINIAN_LANGUAGE
+    native = ukrainian and native_ukrainian
+    with metrics.track_request(mode='stream', language='Ukrainian' if ukrainian else 'English', native=native,
+                               fused=fused, fast=fast) as request:
+        cache_key, cached = get_cached_result(user_message, language, native, fast)
+        if cached is not None:
+            for i, menu in enumerate(cached['menus']):
+                yield 'menu', i, menu
+            request.fields['cached'] = True
+            yield 'result', None, cached
+            return
+        # Identical streams in flight at the same time with the same API key share one run, the followers get
+        # the leader's events (stages included) from the start as they are produced
+        events = singleflight.stream('stream', (clients.api_key_hash(api_key), cache_key),
+                                     lambda: stream_pipeline(user_message, api_key, language, native, fused,
+                                                             cache_key, fast))
+        for event, index, data in events:
+            if event == 'progress':
+                progress(data)
+                continue
+            if event == 'result' and data == 'Incorrect request':
+                request.fields['outcome'] = 'incorrect'
+            yield event, index, data
+
+
+def stream_pipeline(user_message, api_key, language, native, fused, cache_key, fast=False) -> Iterator[tuple]:
+    # The uncached part of main_stream, stages are ('progress', None, stage name) events
+    ukrainian = language == UKRAINIAN_LANGUAGE
+    output_language = 'Ukrainian' if native else 'English'
+    model_3_5 = get_model(api_key, FAST_MODEL)
+    model_4 = get_model(api_key, MENU_MODEL)
+    yield 'progress', None, 'Analysing the request'
+    diet_request = get_diet_request(user_message, model_3_5, native, fused)
+    if diet_request == 'Incorrect request':
+        yield 'result', None, 'Incorrect request'
+        return
+    user_info, temp = diet_request
+    translate = ukrainian and not native
+    yield 'progress', None, 'Generating menus'
+    menu_key, cached_menus = get_cached_menus(temp, user_info, output_language, fast)
+    if cached_menus is not None:
+        events = (('menu', i, menu) for i, menu in enumerate(cached_menus['menus']))
+    elif fast:
+        checked_menus = get_diet_options_fast(temp, user_info, model_3_5, model_4, output_language)
+        events = (('menu', i, menu) for i, menu in enumerate(checked_menus['menus']))
+    else:
+        events = stream_diet_options(temp, user_info, model_4, output_language)
+    menus = []
+    generated_menus = []
+    for event, index, data in events:
+        if event == 'menu':
+            generated_menus.append(data)
+            if translate:
+                data = translate_dict(data)
+            menus.append(data)
+            yield event, index, data
+        elif not translate:
+            yield event, index, data
+    if cached_menus is None:
+        result_cache.get_menu_cache().add(menu_key, {'menus': generated_menus})
+    if native:
+        log_translation_saved()
+    diet_options = {'menus': menus}
+    result_cache.get_result_cache().set(cache_key, diet_options)
+    yield 'result', None, diet_options
+
+
+def run_stream(user_message, api_key, language, native_ukrainian=False, fused=True, progress=None, fast=FAST_MODE):
+    # Runs main_stream to the end for a background job, passing every menu and meal event to progress
+    for event in main_stream(user_message, api_key, language, native_ukrainian, fused, progress, fast):
+        if event[0] == 'result':
+            return event[2]
+        if progress:
+            progress(event=event)
 
 
 if __name__ == "__main__":
@@ -203,5 +680,5 @@ if __name__ == "__main__":
                     "suitable diet plan? I'm allergic to peanuts and soy. Also, I don't like onions, but I do like "
                     "apples, keep that in mind.")
     # Call the main function
-    user_info = main(user_message, st.secrets["OPENAI_API_KEY"])
-    print(user_info)
+    diet_options = main(user_message, st.secrets["OPENAI_API_KEY"], "English")
+    print(diet_options)
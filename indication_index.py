@@ -0,0 +1,158 @@
+from typing import Dict, List, Tuple
+from collections import Counter
+from functools import lru_cache
+import math
+import re
+import diets
+
+# Spelling variants and lay terms mapped onto the words used in the diet indications
+MEDICAL_SYNONYMS = {
+    'oesophagitis': 'esophagitis',
+    'oesophagus': 'esophagus',
+    'haemorrhoids': 'hemorrhoids',
+    'anaemia': 'anemia',
+    'diarrhoea': 'diarrhea',
+    'ulcers': 'ulcer',
+    'heartburn': 'gastritis increased acidity',
+    'reflux': 'esophagitis',
+    'gerd': 'esophagitis',
+    'overweight': 'obesity',
+    'diabetic': 'diabetes',
+    'hypertension': 'hypertensive',
+    'pressure': 'hypertensive',
+    'kidney': 'kidneys nephritis',
+    'renal': 'kidneys nephritis',
+    'liver': 'liver hepatitis',
+    'gallbladder': 'cholecystitis',
+    'pancreas': 'pancreatitis',
+    'constipated': 'constipation',
+    'stroke': 'stroke cerebral',
+    'infarction': 'infarction myocardial',
+    'heart': 'heart cardiovascular',
+    'flu': 'infectious febrile',
+    'influenza': 'infectious febrile',
+    'cold': 'infectious febrile',
+    'covid': 'infectious febrile pneumonia',
+    'surgery': 'postoperative operations',
+    'stones': 'urolithiasis stones',
+    'nerves': 'nervous',
+    'neurological': 'nervous',
+    # Acidity qualifiers are folded onto the words of the indications, they tell Diet № 1 and № 2 apart
+    'excessive': 'increased',
+    'decreased': 'reduced',
+    'hyperacidity': 'increased acidity',
+    'hypoacidity': 'reduced acidity',
+    'печія': 'гастрит підвищеною кислотністю',
+    'печією': 'гастрит підвищеною кислотністю',
+    'надмірна': 'підвищеною',
+    'надмірною': 'підвищеною',
+    'тиск': 'гіпертонічна',
+    'гіпертонія': 'гіпертонічна',
+    'нирки': 'нирок нефрит',
+    'печінка': 'печінки гепатит',
+    'застуда': 'інфекційні гарячковий',
+    'грип': 'інфекційні гарячковий',
+    'операція': 'післяопераційний операцій',
+    'ожиріння': 'ожиріння',
+    'діабет': 'діабет',
+}
+
+# Lay phrasings of the acidity, rewritten before tokenising: 'high' alone is too common to be a synonym
+ACIDITY_PHRASES = [
+    (re.compile(r'\b(?:high|higher|elevated)\s+(?:stomach\s+)?acid(?:ity)?\b'), 'increased acidity'),
+    (re.compile(r'\b(?:low|lower)\s+(?:stomach\s+)?acid(?:ity)?\b'), 'reduced acidity'),
+    (re.compile(r'\bвисок\w*\s+кислотн\w*'), 'підвищеною кислотністю'),
+    (re.compile(r'\bнизьк\w*\s+кислотн\w*'), 'зниженою кислотністю'),
+]
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'by', 'for', 'from', 'have', 'i', 'in', 'is', 'it', 'me', 'my', 'of',
+    'on', 'or', 'the', 'to', 'was', 'with', 'been', 'diagnosed', 'disease', 'diseases', 'period', 'phase',
+    'stage', 'acute', 'chronic', 'first', 'days', 'after',
+    'і', 'й', 'та', 'в', 'у', 'з', 'із', 'на', 'до', 'по', 'або', 'що', 'які', 'мене', 'мені', 'я', 'у', 'в', 'після',
+    'захворювання', 'період', 'періоді', 'фазі', 'стадії', 'гострі', 'гострий', 'хронічні', 'хронічний',
+}
+
+# Tokens are cut to a common stem length, which folds most English and Ukrainian inflections together
+STEM_LENGTH = 6
+BM25_K1 = 1.5
+BM25_B = 0.75
+# The local match is trusted when the best score leads the second best by this share of the best score
+CONFIDENT_MARGIN = 0.3
+CONFIDENT_MIN_SCORE = 2.0
+CANDIDATES_NUMBER = 5
+# Diets whose indications differ only in the stage or the acidity of the same disease. BM25 can't tell them
+# apart reliably, so a match among them is never confident and the LLM chooses between all of them.
+NEAR_DUPLICATE_DIETS = [
+    ('Diet № 1', 'Diet № 1 a', 'Diet № 1 b', 'Diet № 2'),
+    ('Diet № 4', 'Diet № 4 a'),
+    ('Diet № 5', 'Diet № 5 a'),
+    ('Diet № 7', 'Diet № 7 a'),
+    ('Diet № 10', 'Diet № 10 a', 'Diet № 10 c'),
+]
+
+
+def normalise(text: str) -> List[str]:
+    text = text.lower()
+    for pattern, replacement in ACIDITY_PHRASES:
+        text = pattern.sub(replacement, text)
+    words = []
+    for word in re.findall(r'\w+', text):
+        words.extend(MEDICAL_SYNONYMS.get(word, word).split())
+    return [word[:STEM_LENGTH] for word in words if word not in STOP_WORDS and not word.isdigit()]
+
+
+class IndicationIndex:
+    # BM25 index over the indications of every diet, one document per diet with both languages merged
+    def __init__(self, documents: List[str]):
+        self.documents = [Counter(normalise(document)) for document in documents]
+        self.lengths = [sum(document.values()) for document in self.documents]
+        self.average_length = sum(self.lengths) / len(self.lengths)
+        frequencies = Counter(token for document in self.documents for token in document)
+        self.idf = {token: math.log(1 + (len(self.documents) - frequency + 0.5) / (frequency + 0.5))
+                    for token, frequency in frequencies.items()}
+
+    def rank(self, query: str) -> List[Tuple[int, float]]:
+        tokens = set(normalise(query))
+        scores = []
+        for index, (document, length) in enumerate(zip(self.documents, self.lengths)):
+            score = 0.0
+            for token in tokens:
+                frequency = document.get(token)
+                if frequency:
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / self.average_length)
+                    score += self.idf[token] * frequency * (BM25_K1 + 1) / (frequency + norm)
+            scores.append((index, score))
+        return sorted(scores, key=lambda item: item[1], reverse=True)
+
+
+@lru_cache(maxsize=1)
+def get_index() -> IndicationIndex:
+    store = diets.get_store()
+    return IndicationIndex([f"{indications_en} {indications_uk}" for (_, indications_en), (_, indications_uk)
+                            in zip(store.indications('en'), store.indications('uk'))])
+
+
+@lru_cache(maxsize=1)
+def near_duplicates() -> Dict[int, List[int]]:
+    # Diet index -> indexes of its group in NEAR_DUPLICATE_DIETS, by the English diet names
+    indexes = {diet['diet_name']: index for index, diet in enumerate(diets.get_store().diet_list('en'))}
+    groups = {}
+    for names in NEAR_DUPLICATE_DIETS:
+        group = [indexes[name] for name in names if name in indexes]
+        for index in group:
+            groups[index] = group
+    return groups
+
+
+def match(health_info: str) -> Dict:
+    # Returns {'indication_index', 'confident', 'candidates'}, candidates being the top diet indexes
+    ranking = get_index().rank(health_info or '')
+    (best, best_score), (_, second_score) = ranking[0], ranking[1]
+    confident = best_score >= CONFIDENT_MIN_SCORE and best_score - second_score >= CONFIDENT_MARGIN * best_score
+    candidates = [index for index, score in ranking[:CANDIDATES_NUMBER] if score > 0]
+    group = near_duplicates().get(best) if best_score > 0 else None
+    if group:
+        confident = False
+        candidates += [index for index in group if index not in candidates]
+    return {'indication_index': best if confident else None, 'confident': confident, 'candidates': candidates}
@@ -0,0 +1,161 @@
+from typing import Callable, Dict, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+MAX_RUNNING = int(os.environ.get('DIET_BOT_MAX_JOBS', 8))
+MAX_RUNNING_PER_KEY = int(os.environ.get('DIET_BOT_MAX_JOBS_PER_KEY', 2))
+MAX_QUEUED = int(os.environ.get('DIET_BOT_MAX_QUEUED_JOBS', 50))
+# Finished jobs are kept this long for the page to pick up their result
+FINISHED_JOB_TTL = 60 * 60
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, owner: str, fn: Callable, args: tuple, kwargs: dict):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.status = 'queued'
+        self.stage = None
+        self.stages = []
+        # Menus streamed so far, a menu is complete once its 'menu' event arrived
+        self.partial_menus = []
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def report(self, stage: Optional[str] = None, event: Optional[tuple] = None):
+        # Progress callback passed to the job function: a stage name, or a streaming event (event, index, data)
+        with self._lock:
+            if stage is not None:
+                self.stage = stage
+                self.stages.append((stage, time.time()))
+            if event is not None:
+                kind, index, data = event
+                menu_index = index[0] if kind == 'meal' else index
+                while len(self.partial_menus) <= menu_index:
+                    self.partial_menus.append({'meals': [], 'complete': False})
+                if kind == 'meal':
+                    self.partial_menus[menu_index]['meals'].append(data)
+                elif kind == 'menu':
+                    self.partial_menus[menu_index] = dict(data, complete=True)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'id': self.id,
+                'status': self.status,
+                'stage': self.stage,
+                'stages': list(self.stages),
+                'partial_menus': [dict(menu, meals=list(menu['meals'])) for menu in self.partial_menus],
+                'result': self.result,
+                'error': self.error,
+                'created': self.created,
+                'finished': self.finished,
+            }
+
+
+class JobExecutor:
+    # Runs generation jobs on a thread pool outside the Streamlit script thread, so reruns don't abandon them.
+    # At most max_running jobs run at once and at most max_running_per_key for one API key, the rest wait
+    # in a bounded queue in submission order.
+    def __init__(self, max_running: int = MAX_RUNNING, max_running_per_key: int = MAX_RUNNING_PER_KEY,
+                 max_queued: int = MAX_QUEUED):
+        self.max_running = max_running
+        self.max_running_per_key = max_running_per_key
+        self.max_queued = max_queued
+        self._pool = ThreadPoolExecutor(max_workers=max_running, thread_name_prefix='diet-job')
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._queue = deque()
+        self._running = {}
+
+    def submit(self, api_key: str, fn: Callable, *args, **kwargs) -> str:
+        # fn is called as fn(*args, progress=job.report, **kwargs)
+        owner = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+        job = Job(owner, fn, args, kwargs)
+        with self._lock:
+            self._forget_finished()
+            if len(self._queue) >= self.max_queued:
+                raise JobQueueFull(f"{len(self._queue)} jobs are already waiting")
+            self._jobs[job.id] = job
+            self._queue.append(job)
+            self._dispatch()
+        return job.id
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        snapshot = job.snapshot()
+        if snapshot['status'] == 'queued':
+            with self._lock:
+                snapshot['queue_position'] = next((i for i, queued in enumerate(self._queue) if queued is job), 0)
+        return snapshot
+
+    def _dispatch(self):
+        # Starts every queued job that fits into the global and per key limits, called with the lock held
+        running = sum(self._running.values())
+        for job in list(self._queue):
+            if running >= self.max_running:
+                break
+            if self._running.get(job.owner, 0) >= self.max_running_per_key:
+                continue
+            self._queue.remove(job)
+            self._running[job.owner] = self._running.get(job.owner, 0) + 1
+            running += 1
+            job.status = 'running'
+            self._pool.submit(self._run, job)
+
+    def _run(self, job: Job):
+        try:
+            result = job.fn(*job.args, progress=job.report, **job.kwargs)
+            with job._lock:
+                job.result = result
+                job.status = 'done'
+        except Exception as e:
+            logger.exception("Job %s failed", job.id)
+            with job._lock:
+                job.error = e
+                job.status = 'failed'
+        finally:
+            job.finished = time.time()
+            job.fn = job.args = job.kwargs = None
+            with self._lock:
+                self._running[job.owner] -= 1
+                if not self._running[job.owner]:
+                    del self._running[job.owner]
+                self._dispatch()
+
+    def _forget_finished(self):
+        now = time.time()
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished is not None and now - job.finished > FINISHED_JOB_TTL]:
+            del self._jobs[job_id]
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> JobExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = JobExecutor()
+    return _executor
@@ -1,12 +1,15 @@
 import streamlit as st
-from openai import AuthenticationError
-from functions import main
-from pdf_generator import generate_pdf
+import os
 import time
 
+# The LLM stack (functions) and openai are imported on first submit, reportlab (pdf_generator) once there are
+# menus to show, so the page renders before they are loaded. Generation runs in background jobs (jobs).
+
 # Title and language selection
 st.title('🍉🤖 Diet Bot')
 language = st.radio("Select the language of your request and response:", ["English", "Ukrainian ***:red[beta]***"])
+native_ukrainian = language != "English" and st.checkbox(
+    "Generate the menu directly in Ukrainian (faster, no machine translation)", value=True)
 
 # Sidebar for OpenAI API key input
 st.sidebar.write("**Disclaimer**⚠️ \n\n"
@@ -21,16 +24,61 @@ st.sidebar.write("**Disclaimer**⚠️ \n\n"
 disclaimer = st.sidebar.checkbox("I have read and agree to the terms of the disclaimer.")
 if disclaimer:
     openai_api_key = st.sidebar.text_input('OpenAI API Key', type='password')
+generation_mode = st.sidebar.radio("Generation mode:", ["Streaming", "Parallel", "Single request"],
+                                   help="Streaming shows menus as soon as they are generated, "
+                                        "parallel generates all menus at once and shows them together.")
+fast_mode = st.sidebar.checkbox("Fast mode", value=os.environ.get('DIET_BOT_FAST_MODE', '0') == '1',
+                                help="Menus are generated by GPT-3.5 and checked for the diet's excluded foods "
+                                     "and your allergies and exclusions, GPT-4 only redoes them when a check fails.")
+show_metrics = st.sidebar.checkbox("Show performance metrics")
 
 # Initialization result
 if 'result' not in st.session_state:
     st.session_state['result'] = ''
+# Id of the background generation job of this session
+if 'job_id' not in st.session_state:
+    st.session_state['job_id'] = None
+# PDF and ZIP exports of the current result, rendered on request
+if 'downloads' not in st.session_state:
+    st.session_state['downloads'] = None
+
+
+# Functions to display menus
+def render_meal(meal, currency):
+    st.subheader(f"{meal['description']}")
+    for dish in meal['dishes']:
+        st.write(f"**:violet[Name]: {dish['name']}**")
+        st.write(f"**:orange[Ingredients]:** {', '.join(dish['ingredients'])}")
+        st.write(f"**:blue[Cooking Instructions]:** {dish['cooking_instructions']}")
+        st.write(f"**:green[Price]:** {dish['price']} {currency}")
 
 
-# Function to generate response
-def generate_response(input_text, api_key, language):
-    with st.spinner('Wait about 1.5 minutes...'):
-        st.session_state['result'] = main(input_text, api_key, language)
+def show_job_progress(job):
+    # Current stage and the menus (or meals, when streaming) generated so far
+    if job['status'] == 'queued':
+        st.info(f"Your request is waiting in the queue (position {job['queue_position'] + 1})...", icon='⏳')
+    else:
+        st.info(f"{job['stage'] or 'Starting'}... The page updates by itself, the menus will appear here.", icon='⏳')
+    for i, menu in enumerate(job['partial_menus']):
+        with st.expander(f"**Menu {i + 1}**", expanded=True):
+            for meal in menu['meals']:
+                render_meal(meal, menu.get('currency', 'грн' if native_ukrainian else 'UAH'))
+
+
+# Function to generate response in a background job that survives reruns of this script
+def generate_response(input_text, api_key, language, mode='single'):
+    import functions
+    import jobs
+    if mode == 'stream':
+        fn, args = functions.run_stream, (input_text, api_key, language, native_ukrainian)
+    else:
+        fn, args = functions.main, (input_text, api_key, language, mode, native_ukrainian)
+    try:
+        st.session_state['job_id'] = jobs.get_executor().submit(api_key, fn, *args, fast=fast_mode)
+        st.session_state['result'] = ''
+        st.session_state['downloads'] = None
+    except jobs.JobQueueFull:
+        st.warning('The bot is busy right now, please try again in a minute.', icon='⚠')
 
 
 # Main content
@@ -54,40 +102,103 @@ with st.form('my_form'):
         # Process submitted form
         if submitted and openai_api_key.startswith('sk-'):
             if text:
-                try:
+                if generation_mode == "Streaming":
+                    generate_response(text, openai_api_key, language, 'stream')
+                elif generation_mode == "Parallel":
+                    generate_response(text, openai_api_key, language, 'parallel')
+                else:
                     generate_response(text, openai_api_key, language)
-                except AuthenticationError:
-                    st.error('Please enter correct OpenAI API key!', icon='⚠')
             else:
                 st.info('Please enter your request.', icon='⚠')
     except NameError:
         st.error('Please read and accept the disclaimer.', icon='⚠')
 
+# Poll the background job, the script reruns every second until the job has finished
+if st.session_state['job_id']:
+    import jobs
+    job = jobs.get_executor().status(st.session_state['job_id'])
+    if job is None:
+        st.session_state['job_id'] = None
+    elif job['status'] in ('queued', 'running'):
+        show_job_progress(job)
+        time.sleep(1)
+        st.rerun()
+    else:
+        st.session_state['job_id'] = None
+        if job['status'] == 'done':
+            st.session_state['result'] = job['result']
+            st.session_state['downloads'] = None
+        else:
+            from openai import AuthenticationError
+            if isinstance(job['error'], AuthenticationError):
+                st.error('Please enter correct OpenAI API key!', icon='⚠')
+            else:
+                st.error('Sorry, something went wrong while creating your diet, please try again.', icon='⚠')
+
 # Display result if available
 if st.session_state['result']:
     if st.session_state['result'] != 'Incorrect request':
-        st.write("**Created daily diet options:**")
         result = st.session_state['result']
+        if result.get('cached'):
+            st.write("**Created daily diet options** *(cached result, you have already sent this request)*:")
+        else:
+            st.write("**Created daily diet options:**")
+        # Each menu's PDF is rendered on the first display and served from pdf_generator's content-hash cache on
+        # reruns. The bulk PDF and ZIP are built once the user asks for them. Rendering stays in this process:
+        # worker processes would have to start clean (forking the multithreaded server can deadlock), and a
+        # clean start re-runs this page as their __main__.
+        from pdf_generator import generate_pdf, export_menus
+        downloads = st.session_state['downloads']
+        if downloads is None and st.button("Prepare all menus for download", key="prepare-downloads",
+                                           help="All menus as one PDF or a ZIP"):
+            with st.spinner("Preparing the PDFs..."):
+                downloads = {'pdf': export_menus(result['menus']),
+                             'zip': export_menus(result['menus'], combined=False)}
+            st.session_state['downloads'] = downloads
+        if downloads is not None:
+            all_pdf_column, all_zip_column = st.columns(2)
+            all_pdf_column.download_button("Download all menus (PDF)", downloads['pdf'], "diet_plans.pdf",
+                                           mime='application/pdf', key="download-pdf-all")
+            all_zip_column.download_button("Download all menus (ZIP)", downloads['zip'], "diet_plans.zip",
+                                           mime='application/zip', key="download-zip-all")
         for i, menu in enumerate(result['menus']):
             # Create tab for each menu option
             with st.expander(f"**Menu {i + 1}**"):
                 st.write(f"***:red[Total Price]: {menu['total_price']} {menu['currency']}***")
                 for meal in menu['meals']:
-                    st.subheader(f"{meal['description']}")
-                    for dish in meal['dishes']:
-                        st.write(f"**:violet[Name]: {dish['name']}**")
-                        st.write(f"**:orange[Ingredients]:** {', '.join(dish['ingredients'])}")
-                        st.write(f"**:blue[Cooking Instructions]:** {dish['cooking_instructions']}")
-                        st.write(f"**:green[Price]:** {dish['price']} {menu['currency']}")
-                    # Generate PDF button
-                if st.button(f"Generate PDF for Menu {i + 1}", key=f"generate-pdf-menu_{i + 1}"):
-                    with st.spinner('Generating PDF...'):
-                        time.sleep(1)
-                        generate_pdf(menu, f"diet_plan_{i + 1}.pdf")
-                    st.success(f"Generated diet_plan_{i + 1}.pdf!")
-                    with open(f"diet_plan_{i + 1}.pdf", "rb") as f:
-                        st.download_button(f"Download pdf for Menu {i + 1}", f, f"diet_plan_{i + 1}.pdf",
-                                           key=f"download-pdf-menu_{i + 1}")
+                    render_meal(meal, menu['currency'])
+                st.download_button(f"Download pdf for Menu {i + 1}", generate_pdf(menu),
+                                   f"diet_plan_{i + 1}.pdf", mime='application/pdf',
+                                   key=f"download-pdf-menu_{i + 1}")
     else:
         st.error("❗❗❗ Sorry, please write your request again. Please do it right ❗❗❗")
 
+# Performance panel: the last request and p50/p95 per stage over the recent requests of this server
+if show_metrics:
+    import metrics
+    records = metrics.history()
+    with st.sidebar:
+        st.subheader("Performance")
+        if not records:
+            st.caption("No requests yet.")
+        else:
+            last = records[-1]
+            st.write(f"**Last request:** {last['seconds']:.1f} s, ${last['cost']:.4f}, "
+                     f"{last['repair_calls']} repair calls, {last['translation_calls']} translation calls"
+                     f"{' (cached)' if last.get('cached') else ''}"
+                     f"{' (fast mode, escalated to GPT-4)' if last.get('escalations') else ''}")
+            st.table([{'stage': name, 'seconds': round(values['seconds'], 2), 'calls': values['calls']}
+                      for name, values in last['stages'].items()])
+            summary = metrics.aggregate(records)
+            st.write(f"**{summary['requests']} requests:** p50 {summary['seconds']['p50']:.1f} s, "
+                     f"p95 {summary['seconds']['p95']:.1f} s, ${summary['cost']:.4f} in total"
+                     + (f", {summary['escalation_rate']:.0%} of fast mode requests escalated"
+                        if summary['escalation_rate'] is not None else ''))
+            st.table([{'stage': name, 'p50': round(values['p50'], 2), 'p95': round(values['p95'], 2),
+                       'requests': values['requests']} for name, values in summary['stages'].items()])
+            st.table([{'model': name, 'prompt tokens': values['prompt_tokens'],
+                       'completion tokens': values['completion_tokens'], 'cost': round(values['cost'], 4)}
+                      for name, values in summary['models'].items()])
+            st.table([{'stage': name, 'prompts': values['prompts'], 'input tokens': values['input_tokens'],
+                       'estimated tokens': values['estimated_tokens'],
+                       'cached': f"{values['cached_ratio']:.0%}"} for name, values in summary['prompts'].items()])
@@ -0,0 +1,179 @@
+from typing import Dict, List, Optional, Tuple
+import re
+from langchain_core.pydantic_v1 import ValidationError
+
+# Local checks of generated menus for the fast mode cascade: a DailyMenuList from the fast model is kept only
+# when it passes all of them. Matching is by word stems within one dish name or ingredient, so it catches
+# 'Peanut butter' for 'peanuts' but not an onion mentioned in the cooking instructions. Terms and menus are
+# compared as written, a constraint in another language than the menu is not checked.
+
+# Foods behind the common allergy and intolerance names, the name itself is always checked too
+ALLERGEN_FOODS = {
+    'lactose': ['milk', 'cream', 'sour cream', 'cheese', 'cottage cheese', 'butter', 'yogurt', 'kefir'],
+    'dairy': ['milk', 'cream', 'sour cream', 'cheese', 'cottage cheese', 'butter', 'yogurt', 'kefir'],
+    'milk': ['cream', 'sour cream', 'cheese', 'cottage cheese', 'butter', 'yogurt', 'kefir'],
+    'gluten': ['wheat', 'barley', 'rye', 'bread', 'pasta', 'semolina', 'couscous', 'bulgur', 'flour'],
+    'wheat': ['bread', 'pasta', 'semolina', 'couscous', 'bulgur', 'flour'],
+    'tree nuts': ['almond', 'walnut', 'hazelnut', 'cashew', 'pistachio', 'pecan'],
+    'nuts': ['almond', 'walnut', 'hazelnut', 'cashew', 'pistachio', 'pecan', 'peanut'],
+    'shellfish': ['shrimp', 'prawn', 'crab', 'lobster', 'mussel', 'oyster', 'squid'],
+    'seafood': ['shrimp', 'prawn', 'crab', 'lobster', 'mussel', 'oyster', 'squid'],
+    'eggs': ['omelette', 'meringue', 'mayonnaise'],
+    'soy': ['tofu', 'edamame'],
+}
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'any', 'as', 'from', 'in', 'it', 'of', 'on', 'or', 'other', 'the', 'them', 'to', 'with',
+    'various', 'especially', 'containing', 'rich', 'products', 'product', 'foods', 'food', 'dishes', 'dish',
+    'і', 'й', 'та', 'в', 'у', 'з', 'із', 'на', 'до', 'або', 'інші', 'різні', 'особливо', 'продукти', 'страви',
+}
+EMPTY_ANSWERS = ('none', 'no', 'n/a', 'nothing', 'немає', 'ні')
+# 'Lactose intolerance', 'allergic to eggs': the words around the allergen name in the user's answers
+ALLERGY_WORDS = re.compile(r"\b(?:intoleran\w*|allerg\w*|sensitiv\w*|непереносим\w*|алергі\w*)\b")
+ALLERGY_PREPOSITIONS = ('to ', 'of ', 'на ', 'до ')
+# Preparations that the diets' excluded_foods lists share between neighbouring items: 'fried, spicy dishes'
+# means fried dishes, and 'fried meat, fish' fried fish (only between meat and fish, 'spicy foods, spices'
+# bans all spices)
+MODIFIERS = {
+    'fried', 'fatty', 'spicy', 'smoked', 'salted', 'salty', 'pickled', 'canned', 'strong',
+    'смажене', 'смажені', 'смажена', 'смажений', 'жирне', 'жирні', 'жирна', 'жирний', 'гострі', 'гостре',
+    'копчені', 'солоні', 'консервовані', 'міцні', 'міцний',
+}
+MEATS = {'meat', 'fish', 'poultry', "м'ясо", 'риба', 'птиця'}
+# Stem length of the recommended foods filter, short enough for овочі and овочеві to meet
+RECOMMENDED_STEM_LENGTH = 4
+# Longer excluded_foods items are descriptions ('foods that remain in the stomach for a long time'),
+# not something an ingredient can be matched against
+MAX_TERM_WORDS = 3
+STEM_LENGTH = 6
+# Shorter stems only match whole words, so 'pea' doesn't match 'peach' and 'egg' doesn't match 'eggplant'
+MIN_PREFIX_STEM = 4
+
+
+def stem(word: str) -> str:
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        word = word[:-1]
+    return word[:STEM_LENGTH]
+
+
+def stems(text: str) -> List[str]:
+    # Apostrophes stay inside words, м'ясо is one word
+    return [stem(word) for word in re.findall(r"[^\W\d_]+(?:['’ʼ][^\W\d_]+)*", text.casefold())
+            if word not in STOP_WORDS]
+
+
+ALLERGEN_STEMS = {tuple(stems(name)): foods for name, foods in ALLERGEN_FOODS.items()}
+
+
+def split_items(text: Optional[str]) -> List[str]:
+    # List items, parenthesised examples become items of their own
+    if not text:
+        return []
+    items = [item.strip(' .:') for item in re.split(r'[,;()]', text.casefold())]
+    return [item for item in items if item and item not in EMPTY_ANSWERS]
+
+
+def split_terms(text: Optional[str]) -> List[str]:
+    # The user's answers: 'Peanuts and soy.' -> ['peanuts', 'soy'], 'lactose intolerance' -> ['lactose']
+    terms = []
+    for item in split_items(text):
+        for term in re.split(r'\s+(?:and|і|й|та)\s+', item):
+            term = ALLERGY_WORDS.sub(' ', term).strip()
+            for preposition in ALLERGY_PREPOSITIONS:
+                term = term.removeprefix(preposition)
+            if term and term not in EMPTY_ANSWERS:
+                terms.append(term)
+    return terms
+
+
+def diet_terms(diet: Dict) -> List[str]:
+    # The diet's excluded foods as terms. 'And' is not a list separator here: 'meat and fish broths' gives
+    # 'meat broths' and 'fish broths', and a modifier carries over to a bare neighbour. Terms that would
+    # reject one of the diet's own recommended foods ('vegetables' next to 'vegetable salads') are dropped.
+    items = split_items(diet.get('excluded_foods'))
+    terms = []
+    for i, item in enumerate(items):
+        parts = re.split(r'\s+(?:and|і|й|та)\s+', item)
+        words = item.split()
+        previous = items[i - 1].split() if i > 0 else []
+        if (len(parts) > 1 and 1 < len(parts[-1].split()) <= MAX_TERM_WORDS
+                and all(len(part.split()) == 1 for part in parts[:-1])):
+            head = parts[-1].split()[-1]
+            terms.extend([f"{part} {head}" for part in parts[:-1]] + [parts[-1]])
+        elif len(words) == 1 and words[0] in MODIFIERS and i + 1 < len(items):
+            terms.append(f"{item} {items[i + 1].split()[-1]}")
+        elif item in MEATS and len(previous) == 2 and previous[0] in MODIFIERS and previous[1] in MEATS:
+            terms.append(f"{previous[0]} {item}")
+        else:
+            terms.append(item)
+    recommended = [[word[:RECOMMENDED_STEM_LENGTH] for word in stems(item)]
+                   for item in split_items(diet.get('recommended_foods'))]
+    return [term for term in terms
+            if not any(matches([word[:RECOMMENDED_STEM_LENGTH] for word in stems(term)], recommended_stems)
+                       for recommended_stems in recommended)]
+
+
+def term_patterns(terms: List[str], allergens: bool = False) -> List[Tuple[str, List[str]]]:
+    # (term, its stems) for every term short enough to be a food, with allergens the foods behind allergen names
+    patterns = []
+    for term in terms:
+        for food in [term] + (ALLERGEN_STEMS.get(tuple(stems(term)), []) if allergens else []):
+            term_stems = stems(food)
+            if term_stems and len(term_stems) <= MAX_TERM_WORDS:
+                patterns.append((food, term_stems))
+    return patterns
+
+
+def matches(term_stems: List[str], text_stems: List[str]) -> bool:
+    def found(term_stem):
+        if len(term_stem) < MIN_PREFIX_STEM:
+            return term_stem in text_stems
+        return any(text_stem.startswith(term_stem) for text_stem in text_stems)
+    return all(found(term_stem) for term_stem in term_stems)
+
+
+def forbidden_terms(temp: Dict, user_info: Dict) -> Dict[str, List[Tuple[str, List[str]]]]:
+    # Patterns per source: the user's allergies, intolerances and exclusions and the diet's excluded foods
+    return {
+        'allergies': term_patterns(split_terms(user_info.get('allergies')), allergens=True),
+        'intolerances': term_patterns(split_terms(user_info.get('intolerances')), allergens=True),
+        'exclude': term_patterns(split_terms(user_info.get('exclude'))),
+        'excluded_foods': term_patterns(diet_terms(temp)),
+    }
+
+
+def check_menu(menu: Dict, forbidden: Dict, meals_number: int) -> List[str]:
+    problems = []
+    if len(menu['meals']) != meals_number:
+        problems.append(f"{len(menu['meals'])} meals instead of {meals_number}")
+    for meal in menu['meals']:
+        if not meal['dishes']:
+            problems.append(f"meal {meal['meal_number']} has no dishes")
+        for dish in meal['dishes']:
+            if not dish['name'] or not dish['ingredients']:
+                problems.append(f"dish '{dish['name']}' has no name or ingredients")
+            for text in [dish['name']] + dish['ingredients']:
+                text_stems = stems(text)
+                for source, patterns in forbidden.items():
+                    for term, term_stems in patterns:
+                        if matches(term_stems, text_stems):
+                            problems.append(f"'{text}' in '{dish['name']}' matches {source} '{term}'")
+    return problems
+
+
+def check_menus(diet_options, schema, temp: Dict, user_info: Dict, menus_number: int,
+                meals_number: int) -> List[Tuple[Optional[int], str]]:
+    # Returns the problems of diet_options, validated against the schema (functions.DailyMenuList), as
+    # (menu index, description), the index is None for problems of the list as a whole. An empty list means
+    # the menus can be used as they are.
+    try:
+        schema.parse_obj(diet_options)
+    except (ValidationError, TypeError) as e:
+        return [(None, f"invalid DailyMenuList: {e}")]
+    problems = []
+    if len(diet_options['menus']) != menus_number:
+        problems.append((None, f"{len(diet_options['menus'])} menus instead of {menus_number}"))
+    forbidden = forbidden_terms(temp, user_info)
+    for i, menu in enumerate(diet_options['menus']):
+        problems.extend((i, problem) for problem in check_menu(menu, forbidden, meals_number))
+    return problems
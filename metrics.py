@@ -0,0 +1,252 @@
+from typing import Dict, List, Optional
+from collections import deque
+from contextlib import contextmanager
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# USD per 1000 prompt and completion tokens
+MODEL_PRICES = {
+    'gpt-3.5-turbo-0125': (0.0005, 0.0015),
+    'gpt-4-0125-preview': (0.01, 0.03),
+}
+# Every finished request is also appended to this JSON lines file when it is set
+LOG_PATH = os.environ.get('DIET_BOT_METRICS_LOG')
+MAX_HISTORY = int(os.environ.get('DIET_BOT_METRICS_HISTORY', 1000))
+
+# Metrics of the request being handled, clients.run_async and translation carry it into their threads
+_current = contextvars.ContextVar('request_metrics', default=None)
+_history = deque(maxlen=MAX_HISTORY)
+_history_lock = threading.Lock()
+_log_lock = threading.Lock()
+
+
+def cost(model_name: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    prices = MODEL_PRICES.get(model_name)
+    if prices is None:
+        return None
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1000
+
+
+def cached_ratio(entry: Dict) -> float:
+    return entry['cached_tokens'] / entry['input_tokens'] if entry['input_tokens'] else 0.0
+
+
+class RequestMetrics:
+    # Stage timings, tokens per model and counters of one request, filled from the pipeline's threads
+    def __init__(self, **fields):
+        self.id = uuid.uuid4().hex
+        self.fields = fields
+        self.started = time.time()
+        self.seconds = None
+        # stage -> [first start, last end, calls, summed seconds], concurrent calls of a stage overlap
+        self.stages = {}
+        self.models = {}
+        # stage -> prompts, estimated and provider-reported input tokens, provider-cached input tokens
+        self.prompts = {}
+        self.counters = {'repair_calls': 0, 'translation_calls': 0, 'escalations': 0}
+        self._lock = threading.Lock()
+
+    def add_stage(self, stage: str, started: float, finished: float):
+        with self._lock:
+            entry = self.stages.get(stage)
+            if entry is None:
+                self.stages[stage] = [started, finished, 1, finished - started]
+            else:
+                entry[0] = min(entry[0], started)
+                entry[1] = max(entry[1], finished)
+                entry[2] += 1
+                entry[3] += finished - started
+
+    def add_tokens(self, model_name: str, prompt_tokens: int, completion_tokens: int, estimated: bool = False):
+        with self._lock:
+            entry = self.models.setdefault(model_name, {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0,
+                                                        'estimated': False})
+            entry['calls'] += 1
+            entry['prompt_tokens'] += prompt_tokens
+            entry['completion_tokens'] += completion_tokens
+            entry['estimated'] = entry['estimated'] or estimated
+
+    def add_prompt(self, stage: str, estimated_tokens: int = 0, input_tokens: int = 0, cached_tokens: int = 0,
+                   prompts: int = 0):
+        with self._lock:
+            entry = self.prompts.setdefault(stage, {'prompts': 0, 'estimated_tokens': 0, 'input_tokens': 0,
+                                                    'cached_tokens': 0})
+            entry['prompts'] += prompts
+            entry['estimated_tokens'] += estimated_tokens
+            entry['input_tokens'] += input_tokens
+            entry['cached_tokens'] += cached_tokens
+
+    def count(self, counter: str, n: int = 1):
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            models = {name: dict(entry, cost=cost(name, entry['prompt_tokens'], entry['completion_tokens']))
+                      for name, entry in self.models.items()}
+            return {
+                'id': self.id,
+                'started': self.started,
+                'seconds': self.seconds,
+                **self.fields,
+                # seconds is the wall time from the first start to the last end, busy_seconds the summed calls
+                'stages': {stage: {'seconds': finished - started, 'busy_seconds': busy, 'calls': calls}
+                           for stage, (started, finished, calls, busy) in self.stages.items()},
+                'models': models,
+                'cost': sum(entry['cost'] or 0.0 for entry in models.values()),
+                'prompts': {stage: dict(entry, cached_ratio=cached_ratio(entry))
+                            for stage, entry in self.prompts.items()},
+                **self.counters,
+            }
+
+
+@contextmanager
+def track_request(**fields):
+    # Collects the metrics of everything run inside, then logs them and adds them to the history.
+    # A request tracked inside another one (coalesced pipelines) adds to the outer one.
+    request = _current.get()
+    if request is not None:
+        yield request
+        return
+    request = RequestMetrics(**fields)
+    token = _current.set(request)
+    started = time.perf_counter()
+    try:
+        yield request
+    except Exception as e:
+        request.fields['outcome'] = 'error'
+        request.fields['error'] = type(e).__name__
+        raise
+    finally:
+        _current.reset(token)
+        request.seconds = time.perf_counter() - started
+        request.fields.setdefault('outcome', 'ok')
+        finish(request)
+
+
+@contextmanager
+def stage(name: str):
+    request = _current.get()
+    if request is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        request.add_stage(name, started, time.perf_counter())
+
+
+def add_stage(name: str, started: float, finished: float):
+    # For stages that can't be wrapped, started and finished are time.perf_counter() values
+    request = _current.get()
+    if request is not None:
+        request.add_stage(name, started, finished)
+
+
+def timed(name: str):
+    # Decorator version of stage, a generator is timed from its first item to its end
+    def decorator(fn):
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def generator_wrapper(*args, **kwargs):
+                with stage(name):
+                    yield from fn(*args, **kwargs)
+            return generator_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_tokens(model_name: str, usage: Optional[Dict], estimated: bool = False):
+    request = _current.get()
+    if request is not None and usage:
+        request.add_tokens(model_name, usage.get('prompt_tokens', 0), usage.get('completion_tokens', 0), estimated)
+
+
+def record_prompt(stage: str, estimated_tokens: int = 0, input_tokens: int = 0, cached_tokens: int = 0,
+                  prompts: int = 0):
+    request = _current.get()
+    if request is not None:
+        request.add_prompt(stage, estimated_tokens, input_tokens, cached_tokens, prompts)
+
+
+def count(counter: str, n: int = 1):
+    request = _current.get()
+    if request is not None:
+        request.count(counter, n)
+
+
+def finish(request: RequestMetrics):
+    record = request.as_dict()
+    with _history_lock:
+        _history.append(record)
+    line = json.dumps(record, ensure_ascii=False)
+    logger.info("request metrics %s", line)
+    if LOG_PATH:
+        with _log_lock, open(LOG_PATH, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+
+def history() -> List[Dict]:
+    with _history_lock:
+        return list(_history)
+
+
+def percentile(values: List[float], share: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(share * (len(values) - 1))))] if values else 0.0
+
+
+def aggregate(records: Optional[List[Dict]] = None) -> Dict:
+    # p50/p95 of the request and stage wall times, token and cost totals per model over the history
+    records = history() if records is None else records
+    stage_seconds = {}
+    models = {}
+    prompts = {}
+    for record in records:
+        for name, values in record['stages'].items():
+            stage_seconds.setdefault(name, []).append(values['seconds'])
+        for name, values in record['models'].items():
+            totals = models.setdefault(name, {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'cost': 0.0})
+            for key in ('calls', 'prompt_tokens', 'completion_tokens'):
+                totals[key] += values[key]
+            totals['cost'] += values['cost'] or 0.0
+        for name, values in record.get('prompts', {}).items():
+            totals = prompts.setdefault(name, {'prompts': 0, 'estimated_tokens': 0, 'input_tokens': 0,
+                                               'cached_tokens': 0})
+            for key in totals:
+                totals[key] += values[key]
+    request_seconds = [record['seconds'] for record in records]
+    # Share of the fast mode requests whose menus went to the menu model, over the requests that generated menus
+    fast = [record for record in records
+            if record.get('fast') and not record.get('cached') and record.get('outcome') == 'ok']
+    return {
+        'requests': len(records),
+        'cached': sum(1 for record in records if record.get('cached')),
+        'errors': sum(1 for record in records if record.get('outcome') == 'error'),
+        'seconds': {'p50': percentile(request_seconds, 0.5), 'p95': percentile(request_seconds, 0.95)},
+        'stages': {name: {'requests': len(values), 'p50': percentile(values, 0.5),
+                          'p95': percentile(values, 0.95)} for name, values in stage_seconds.items()},
+        'models': models,
+        'cost': sum(totals['cost'] for totals in models.values()),
+        # Prompt input tokens per stage and the share of them the provider served from its prompt cache
+        'prompts': {name: dict(totals, cached_ratio=cached_ratio(totals)) for name, totals in prompts.items()},
+        'repair_calls': sum(record.get('repair_calls', 0) for record in records),
+        'translation_calls': sum(record.get('translation_calls', 0) for record in records),
+        'escalations': sum(record.get('escalations', 0) for record in records),
+        'escalation_rate': (sum(1 for record in fast if record.get('escalations')) / len(fast)) if fast else None,
+    }
@@ -1,17 +1,99 @@
+from typing import Callable, Dict, List
+from collections import OrderedDict
+from functools import lru_cache
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+import zipfile
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
+from reportlab.platypus.tableofcontents import TableOfContents
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.lib.fonts import addMapping
 
+logger = logging.getLogger(__name__)
 
-def generate_pdf(diet, filename):
-    doc = SimpleDocTemplate(filename, pagesize=A4)
+# Rendered PDFs keyed by a hash of the menu content
+PDF_CACHE_SIZE = 64
+_pdf_cache = OrderedDict()
+_pdf_cache_lock = threading.Lock()
+
+# Unicode TTF family for the Ukrainian menus, Helvetica has no Cyrillic glyphs. reportlab embeds only the
+# glyphs a document uses, so the files stay small. A missing bold face falls back to the regular one.
+# DejaVu Sans and its bold face are bundled in fonts/, DIET_BOT_PDF_FONT_DIR can point to another copy
+# with the same file names. The family has no italic faces, so the menus use no <i> markup.
+FONT_NAME = 'DietBotSans'
+BUNDLED_FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fonts')
+FONT_DIRS = [path for path in [os.environ.get('DIET_BOT_PDF_FONT_DIR'), BUNDLED_FONT_DIR,
+                               '/usr/share/fonts/truetype/dejavu', '/usr/share/fonts/dejavu', '/usr/share/fonts/TTF',
+                               '/Library/Fonts'] if path]
+FONT_FILES = {
+    'normal': 'DejaVuSans.ttf',
+    'bold': 'DejaVuSans-Bold.ttf',
+}
+
+# Export calls and seconds spent, per export format
+export_stats = {}
+
+
+def menu_hash(diet) -> str:
+    return hashlib.sha256(json.dumps(diet, ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+
+
+def find_font(filename: str):
+    for directory in FONT_DIRS:
+        path = os.path.join(directory, filename)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+@lru_cache(maxsize=1)
+def register_fonts() -> Dict[str, str]:
+    # Registers the TTF family once per process, returns the font name per variant. There is no fallback,
+    # a PDF in a font without Cyrillic glyphs would print the Ukrainian menus as black boxes.
+    paths = {variant: find_font(filename) for variant, filename in FONT_FILES.items()}
+    if paths['normal'] is None:
+        raise FileNotFoundError(f"{FONT_FILES['normal']} not found in {FONT_DIRS}, the PDFs need a font with "
+                                f"Cyrillic glyphs")
+    paths['bold'] = paths['bold'] or paths['normal']
+    fonts = {variant: FONT_NAME if variant == 'normal' else f"{FONT_NAME}-{variant}" for variant in paths}
+    for variant, path in paths.items():
+        font = TTFont(fonts[variant], path)
+        if ord('Ж') not in font.face.charToGlyph:
+            raise ValueError(f"{path} has no Cyrillic glyphs")
+        pdfmetrics.registerFont(font)
+    # <b> in paragraphs maps onto the bold face
+    addMapping(FONT_NAME, 0, 0, fonts['normal'])
+    addMapping(FONT_NAME, 1, 0, fonts['bold'])
+    return fonts
+
+
+@lru_cache(maxsize=1)
+def get_styles() -> StyleSheet1:
+    # Built once per process and shared by every document, paragraphs only read their styles
+    fonts = register_fonts()
     styles = getSampleStyleSheet()
+    styles['Normal'].fontName = fonts['normal']
+    for name in ('Title', 'Heading1', 'Heading2'):
+        styles[name].fontName = fonts['bold']
+    styles.add(ParagraphStyle('TOCLevel0', parent=styles['Normal'], fontSize=12, leading=16,
+                              leftIndent=20, firstLineIndent=-20, spaceBefore=4))
+    return styles
+
 
+def menu_content(diet, styles, title: str = "Diet Plan") -> List:
     # Content
     content = []
 
     # Header
-    content.append(Paragraph("<b>Diet Plan</b>", styles['Heading1']))
+    content.append(Paragraph("<b>{}</b>".format(title), styles['Heading1']))
     content.append(Spacer(1, 12))
     content.append(
         Paragraph("<b>Total Price:</b> {} {}".format(diet['total_price'], diet['currency']), styles['Normal']))
@@ -23,14 +105,92 @@ def generate_pdf(diet, filename):
             Paragraph("<b>Meal {}: {}</b>".format(meal['meal_number'], meal['description']), styles['Heading2']))
         content.append(Spacer(1, 6))
         for dish in meal['dishes']:
-            content.append(Paragraph("<i>Dish:</i> {}".format(dish['name']), styles['Normal']))
-            content.append(Paragraph("<i>Ingredients:</i> {}".format(", ".join(dish['ingredients'])), styles['Normal']))
+            content.append(Paragraph("<b>Dish:</b> {}".format(dish['name']), styles['Normal']))
+            content.append(Paragraph("<b>Ingredients:</b> {}".format(", ".join(dish['ingredients'])), styles['Normal']))
             content.append(
-                Paragraph("<i>Cooking Instructions:</i> {}".format(dish['cooking_instructions']), styles['Normal']))
-            content.append(Paragraph("<i>Price:</i> {} {}".format(dish['price'], diet['currency']), styles['Normal']))
+                Paragraph("<b>Cooking Instructions:</b> {}".format(dish['cooking_instructions']), styles['Normal']))
+            content.append(Paragraph("<b>Price:</b> {} {}".format(dish['price'], diet['currency']), styles['Normal']))
             content.append(Spacer(1, 6))
         content.append(
             Paragraph("<b>Total Price:</b> {} {}".format(meal['total_price'], diet['currency']), styles['Normal']))
         content.append(Spacer(1, 12))
+    return content
+
+
+def render_pdf(diet) -> bytes:
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    doc.build(menu_content(diet, get_styles()))
+    return buffer.getvalue()
+
+
+class CombinedDocTemplate(SimpleDocTemplate):
+    # Every menu heading becomes a table of contents entry
+    def afterFlowable(self, flowable):
+        if isinstance(flowable, Paragraph) and flowable.style.name == 'Heading1':
+            self.notify('TOCEntry', (0, flowable.getPlainText(), self.page))
+
+
+def render_combined_pdf(diets: List[Dict]) -> bytes:
+    # All menus in one document after a table of contents, multiBuild lays it out until the page numbers settle
+    buffer = io.BytesIO()
+    doc = CombinedDocTemplate(buffer, pagesize=A4)
+    styles = get_styles()
+    table_of_contents = TableOfContents()
+    table_of_contents.levelStyles = [styles['TOCLevel0']]
+    content = [Paragraph("Diet Plans", styles['Title']), table_of_contents]
+    for i, diet in enumerate(diets):
+        content.append(PageBreak())
+        content.extend(menu_content(diet, styles, f"Diet Plan {i + 1}"))
+    doc.multiBuild(content)
+    return buffer.getvalue()
+
+
+def render_zip(pdfs: List[bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for i, pdf in enumerate(pdfs):
+            archive.writestr(f"diet_plan_{i + 1}.pdf", pdf)
+    return buffer.getvalue()
+
+
+def cached(key: str, render: Callable[[], bytes]) -> bytes:
+    with _pdf_cache_lock:
+        pdf = _pdf_cache.get(key)
+        if pdf is not None:
+            _pdf_cache.move_to_end(key)
+    if pdf is None:
+        pdf = render()
+        with _pdf_cache_lock:
+            _pdf_cache[key] = pdf
+            while len(_pdf_cache) > PDF_CACHE_SIZE:
+                _pdf_cache.popitem(last=False)
+    return pdf
+
+
+def generate_pdf(diet, filename=None) -> bytes:
+    # Renders the menu in memory and returns the PDF bytes, identical menus are rendered once.
+    # The file is only written when a filename is given.
+    pdf = cached(menu_hash(diet), lambda: render_pdf(diet))
+    if filename:
+        with open(filename, 'wb') as f:
+            f.write(pdf)
+    return pdf
+
 
-    doc.build(content)
+def export_menus(diets: List[Dict], combined: bool = True) -> bytes:
+    # Exports every menu of a result at once: one PDF with a table of contents (combined) or a zip with a PDF
+    # per menu. Rendering stays in this process, a process pool measured no faster for a result's few menus
+    # than its own startup and pickling cost. The zip reuses the per-menu PDFs already in the cache.
+    started = time.perf_counter()
+    export_format = 'combined' if combined else 'zip'
+    if combined:
+        data = cached(f"combined:{menu_hash(diets)}", lambda: render_combined_pdf(diets))
+    else:
+        data = render_zip([generate_pdf(diet) for diet in diets])
+    elapsed = time.perf_counter() - started
+    stats = export_stats.setdefault(export_format, {'calls': 0, 'seconds': 0.0})
+    stats['calls'] += 1
+    stats['seconds'] += elapsed
+    logger.info("Exported %d menus as %s in %.3f s", len(diets), export_format, elapsed)
+    return data
@@ -0,0 +1,100 @@
+from typing import Dict, List, Optional
+from functools import lru_cache
+import json
+import logging
+import os
+import threading
+import tiktoken
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Input token budget per stage, a prompt above its budget is logged as a warning. DIET_BOT_PROMPT_TOKEN_BUDGET
+# is the budget of stages not listed here, DIET_BOT_PROMPT_TOKEN_BUDGET_<STAGE> overrides a listed one
+# (DIET_BOT_PROMPT_TOKEN_BUDGET_USER_INFO for user_info)
+DEFAULT_TOKEN_BUDGET = int(os.environ.get('DIET_BOT_PROMPT_TOKEN_BUDGET', 4000))
+TOKEN_BUDGETS = {
+    stage: int(os.environ.get(f'DIET_BOT_PROMPT_TOKEN_BUDGET_{stage.upper()}', budget))
+    for stage, budget in {
+        'user_info': 1000,
+        'indication': 2500,
+        'request_info': 3000,
+        'diet_options': 2000,
+        'diet_option': 2000,
+    }.items()
+}
+
+# Prompts, input tokens and provider-cached input tokens per stage over the process, each request's share is
+# also added to its metrics record
+prompt_stats = {}
+_stats_lock = threading.Lock()
+
+
+def compact(data) -> str:
+    # JSON without spaces and escapes is several times shorter than the Python repr of the same dict
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def compact_indications(indications_list: List[tuple]) -> str:
+    return '\n'.join(f"{index}: {indications}" for index, indications in indications_list)
+
+
+def build(static_parts: List[str], dynamic_parts: List[str]) -> str:
+    # Static parts go first so the prefix is identical across requests and provider prompt caching can hit it
+    return '\n'.join(static_parts + dynamic_parts)
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model_name: str):
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            return tiktoken.get_encoding('cl100k_base')
+    except Exception as e:
+        # tiktoken downloads its encodings on first use, measuring must not break the request when it can't
+        logger.warning("Token encoding for %s is unavailable, estimating tokens from length: %s", model_name, e)
+        return None
+
+
+def count_tokens(text: str, model_name: str) -> int:
+    encoding = get_encoding(model_name)
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode(text))
+
+
+def measure(stage: str, prompt: str, model_name: str) -> int:
+    tokens = count_tokens(prompt, model_name)
+    budget = TOKEN_BUDGETS.get(stage, DEFAULT_TOKEN_BUDGET)
+    if tokens > budget:
+        logger.warning("Prompt of stage %s has %d tokens, over its budget of %d", stage, tokens, budget)
+    with _stats_lock:
+        stats = prompt_stats.setdefault(stage, {'prompts': 0, 'estimated_tokens': 0, 'input_tokens': 0,
+                                                'cached_tokens': 0})
+        stats['prompts'] += 1
+        stats['estimated_tokens'] += tokens
+    metrics.record_prompt(stage, estimated_tokens=tokens, prompts=1)
+    return tokens
+
+
+def record_usage(stage: str, message) -> Optional[Dict]:
+    # Takes the provider's usage from a response message, cached_tokens is only reported by newer API versions
+    usage = (getattr(message, 'response_metadata', None) or {}).get('token_usage') or {}
+    if not usage:
+        return None
+    cached = (usage.get('prompt_tokens_details') or {}).get('cached_tokens') or 0
+    with _stats_lock:
+        stats = prompt_stats.setdefault(stage, {'prompts': 0, 'estimated_tokens': 0, 'input_tokens': 0,
+                                                'cached_tokens': 0})
+        stats['input_tokens'] += usage.get('prompt_tokens', 0)
+        stats['cached_tokens'] += cached
+    metrics.record_prompt(stage, input_tokens=usage.get('prompt_tokens', 0), cached_tokens=cached)
+    return usage
+
+
+def report() -> Dict:
+    with _stats_lock:
+        return {stage: dict(stats, cached_ratio=stats['cached_tokens'] / stats['input_tokens']
+                            if stats['input_tokens'] else 0.0)
+                for stage, stats in prompt_stats.items()}
@@ -0,0 +1,219 @@
+from typing import Any, Optional
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_DISK_PATH = os.environ.get('DIET_BOT_RESULT_CACHE_PATH',
+                                   os.path.join(os.path.expanduser('~'), '.cache', 'diet-bot', 'results.sqlite3'))
+DEFAULT_MENU_DISK_PATH = os.environ.get('DIET_BOT_MENU_CACHE_PATH',
+                                        os.path.join(os.path.expanduser('~'), '.cache', 'diet-bot', 'menus.sqlite3'))
+# Menu cache requests are misses until this many variants are stored, a single variant would serve every
+# request with the same constraints the same menus
+DEFAULT_MIN_VARIANTS = 2
+
+
+class MemoryBackend:
+    # Process-local LRU dict of key -> (expires_at, value)
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskBackend:
+    # SQLite file shared by every process on the host, values are stored as JSON
+    def __init__(self, path: str = DEFAULT_DISK_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute("SELECT value, expires_at FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._connection.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._connection.commit()
+                return None
+            self._connection.execute("UPDATE results SET last_used = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float):
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now + ttl, now))
+            self._connection.execute("DELETE FROM results WHERE expires_at < ?", (now,))
+            self._connection.execute(
+                "DELETE FROM results WHERE key NOT IN (SELECT key FROM results ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,))
+            self._connection.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+def normalise_message(message: str) -> str:
+    return re.sub(r'\s+', ' ', message).strip().casefold()
+
+
+def make_key(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+
+
+class ResultCache:
+    # Full pipeline results keyed by the normalised message, language, model versions and pipeline options
+    def __init__(self, backend, ttl: float = DEFAULT_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, message: str, language: str, models: tuple, options: dict) -> str:
+        return make_key(normalise_message(message), language, list(models), options)
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any):
+        self.backend.set(key, value, self.ttl)
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    # The backend is chosen with DIET_BOT_RESULT_CACHE: 'memory' (default) or 'disk'
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            if os.environ.get('DIET_BOT_RESULT_CACHE', 'memory') == 'disk':
+                backend = DiskBackend()
+            else:
+                backend = MemoryBackend()
+            _result_cache = ResultCache(backend, float(os.environ.get('DIET_BOT_RESULT_CACHE_TTL', DEFAULT_TTL)))
+    return _result_cache
+
+
+def normalise_terms(text: Optional[str]) -> list:
+    # 'Peanuts and soy.' and 'soy, peanuts' give the same sorted term list, empty answers give []
+    if not text:
+        return []
+    terms = re.split(r',|;|\band\b|\bі\b|\bта\b', normalise_message(text))
+    terms = {term.strip(' .') for term in terms}
+    return sorted(term for term in terms if term and term not in ('none', 'no', 'n/a', 'немає', 'ні'))
+
+
+class MenuCache:
+    # Generated DailyMenuList results keyed on the canonical diet constraints rather than the message text,
+    # up to max_variants results are kept per key and served in rotation. Every variant expires ttl seconds
+    # after it was added, serving it doesn't extend that.
+    def __init__(self, backend, ttl: float = DEFAULT_TTL, max_variants: int = 3,
+                 min_variants: int = DEFAULT_MIN_VARIANTS):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_variants = max_variants
+        # Requests are treated as misses until this many variants are stored, so the rotation has choices
+        self.min_variants = min_variants
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, diet_name: str, user_info: dict, output_language: str, models: tuple) -> str:
+        constraints = {field: normalise_terms(user_info.get(field))
+                       for field in ('allergies', 'intolerances', 'exclude', 'add')}
+        return make_key(diet_name, constraints, output_language, list(models))
+
+    def live(self, entry: Optional[dict]) -> dict:
+        # The entry without its expired variants, entries stored before 'added' existed have none left
+        now = time.time()
+        variants = [(added, variant) for added, variant in zip((entry or {}).get('added', []),
+                                                               (entry or {}).get('variants', []))
+                    if added + self.ttl > now]
+        return {'variants': [variant for _, variant in variants], 'added': [added for added, _ in variants],
+                'served': (entry or {}).get('served', 0)}
+
+    def get(self, key: str, rotate: bool = True) -> Optional[dict]:
+        entry = self.live(self.backend.get(key))
+        if len(entry['variants']) < self.min_variants:
+            self.misses += 1
+            return None
+        self.hits += 1
+        served = entry['served']
+        variant = entry['variants'][served % len(entry['variants'])]
+        if not rotate:
+            return variant
+        # Written back with the time the newest variant has left, not a fresh ttl
+        self.backend.set(key, dict(entry, served=served + 1), max(entry['added']) + self.ttl - time.time())
+        shift = served // len(entry['variants']) % max(len(variant['menus']), 1)
+        return {'menus': variant['menus'][shift:] + variant['menus'][:shift]}
+
+    def add(self, key: str, diet_options: dict):
+        entry = self.live(self.backend.get(key))
+        variants = (entry['variants'] + [diet_options])[-self.max_variants:]
+        added = (entry['added'] + [time.time()])[-self.max_variants:]
+        self.backend.set(key, dict(entry, variants=variants, added=added), self.ttl)
+
+
+_menu_cache = None
+_menu_cache_lock = threading.Lock()
+
+
+def get_menu_cache() -> MenuCache:
+    # Uses the same backend choice as the result cache, in its own file (DIET_BOT_MENU_CACHE_PATH) or dict
+    global _menu_cache
+    with _menu_cache_lock:
+        if _menu_cache is None:
+            if os.environ.get('DIET_BOT_RESULT_CACHE', 'memory') == 'disk':
+                backend = DiskBackend(DEFAULT_MENU_DISK_PATH)
+            else:
+                backend = MemoryBackend()
+            _menu_cache = MenuCache(backend, float(os.environ.get('DIET_BOT_RESULT_CACHE_TTL', DEFAULT_TTL)),
+                                    min_variants=int(os.environ.get('DIET_BOT_MENU_CACHE_MIN_VARIANTS',
+                                                                    DEFAULT_MIN_VARIANTS)))
+    return _menu_cache
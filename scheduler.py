@@ -0,0 +1,305 @@
+from typing import Awaitable, Callable, Dict, Iterator, Optional
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+import random
+import threading
+import time
+import openai
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# (requests per minute, tokens per minute) per model and API key, like OpenAI's limits. DIET_BOT_RATE_LIMITS
+# overrides them with a JSON object like {"gpt-4-0125-preview": [500, 150000]}
+RATE_LIMITS = {
+    'gpt-3.5-turbo-0125': (3500, 60000),
+    'gpt-4-0125-preview': (500, 150000),
+}
+RATE_LIMITS.update({model: tuple(limits) for model, limits
+                    in json.loads(os.environ.get('DIET_BOT_RATE_LIMITS', '{}')).items()})
+DEFAULT_RATE_LIMITS = (500, 60000)
+# Calls in flight across all models, the last RESERVED_FAST_CALLS can only be taken by the fast stages,
+# so the analysis of a new request never waits behind long menu generations
+MAX_IN_FLIGHT = int(os.environ.get('DIET_BOT_MAX_LLM_CALLS', 32))
+RESERVED_FAST_CALLS = int(os.environ.get('DIET_BOT_RESERVED_FAST_CALLS', 4))
+# Lower goes first, stages not listed have the lowest priority
+STAGE_PRIORITIES = {'user_info': 0, 'indication': 0, 'request_info': 0}
+LOW_PRIORITY = 1
+# Completion tokens counted against the budget before a call, corrected with the real usage afterwards
+EXPECTED_COMPLETION_TOKENS = {'user_info': 100, 'indication': 80, 'request_info': 120, 'diet_options': 2500,
+                              'diet_option': 900}
+DEFAULT_COMPLETION_TOKENS = 500
+MAX_RETRIES = int(os.environ.get('DIET_BOT_LLM_MAX_RETRIES', 5))
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+# Rate limits and errors worth another try, everything else goes straight to the caller. An exhausted quota
+# is a RateLimitError too, but it doesn't recover by waiting.
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+PERMANENT_ERROR_CODES = {'insufficient_quota'}
+
+
+class TokenBucket:
+    # Refills continuously up to capacity, a charge can leave it negative when usage was underestimated
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_seconds(self, amount: float) -> float:
+        # Seconds until the bucket holds amount, never more than a full bucket
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def charge(self, amount: float):
+        self.level -= amount
+
+
+class Ticket:
+    def __init__(self, key_hash: str, model_name: str, stage: str, tokens: int, seq: int):
+        self.model_name = model_name
+        # Buckets, pauses and the waiting queue are per API key and model
+        self.limits_key = (key_hash, model_name)
+        self.stage = stage
+        # A repair call has the priority of the stage it repairs
+        self.priority = STAGE_PRIORITIES.get(stage.removesuffix('_repair'), LOW_PRIORITY)
+        self.tokens = tokens
+        self.seq = seq
+
+    def __lt__(self, other: 'Ticket') -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class Scheduler:
+    # Admits calls through request and token buckets per API key and model and a shared in-flight limit.
+    # Waiting calls of a key and model are admitted in (priority, arrival) order. One key's traffic and 429s
+    # never hold up the calls of another key.
+    def __init__(self, max_in_flight: int = MAX_IN_FLIGHT, reserved_fast_calls: int = RESERVED_FAST_CALLS):
+        self.max_in_flight = max_in_flight
+        self.reserved_fast_calls = min(reserved_fast_calls, max_in_flight - 1)
+        self.in_flight = 0
+        self._buckets = {}
+        # (API key hash, model) pairs that returned 429 are paused until this monotonic time
+        self._paused_until = {}
+        self._waiting = {}
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self.stats = {}
+
+    def _model_buckets(self, limits_key: tuple):
+        buckets = self._buckets.get(limits_key)
+        if buckets is None:
+            requests_per_minute, tokens_per_minute = RATE_LIMITS.get(limits_key[1], DEFAULT_RATE_LIMITS)
+            buckets = self._buckets[limits_key] = (TokenBucket(requests_per_minute), TokenBucket(tokens_per_minute))
+        return buckets
+
+    def _model_stats(self, model_name: str) -> Dict:
+        return self.stats.setdefault(model_name, {'calls': 0, 'retries': 0, 'rate_limited': 0,
+                                                  'waited_seconds': 0.0})
+
+    def _try_admit(self, ticket: Ticket) -> Optional[float]:
+        # Admits the ticket and returns None, or returns how long to wait before trying again. Called with the
+        # condition held.
+        now = time.monotonic()
+        if self._waiting[ticket.limits_key][0] is not ticket:
+            return 1.0
+        limit = self.max_in_flight
+        if ticket.priority >= LOW_PRIORITY:
+            limit -= self.reserved_fast_calls
+        if self.in_flight >= limit:
+            return 1.0
+        paused = self._paused_until.get(ticket.limits_key, 0.0) - now
+        if paused > 0:
+            return paused
+        requests, tokens = self._model_buckets(ticket.limits_key)
+        requests.refill(now)
+        tokens.refill(now)
+        wait = max(requests.wait_seconds(1), tokens.wait_seconds(ticket.tokens))
+        if wait > 0:
+            return wait
+        requests.charge(1)
+        tokens.charge(ticket.tokens)
+        heapq.heappop(self._waiting[ticket.limits_key])
+        self.in_flight += 1
+        self._model_stats(ticket.model_name)['calls'] += 1
+        self._condition.notify_all()
+        return None
+
+    def _enqueue(self, key_hash: str, model_name: str, stage: str, tokens: int) -> Ticket:
+        ticket = Ticket(key_hash, model_name, stage, tokens, next(self._seq))
+        with self._condition:
+            heapq.heappush(self._waiting.setdefault(ticket.limits_key, []), ticket)
+        return ticket
+
+    def _dequeue(self, ticket: Ticket):
+        # Drops a ticket that gave up waiting (a cancelled task), so it doesn't hold up its model
+        with self._condition:
+            waiting = self._waiting[ticket.limits_key]
+            if ticket in waiting:
+                waiting.remove(ticket)
+                heapq.heapify(waiting)
+                self._condition.notify_all()
+
+    def acquire(self, key_hash: str, model_name: str, stage: str, tokens: int) -> Ticket:
+        started = time.monotonic()
+        ticket = self._enqueue(key_hash, model_name, stage, tokens)
+        try:
+            with self._condition:
+                while (wait := self._try_admit(ticket)) is not None:
+                    self._condition.wait(timeout=wait)
+                self._model_stats(model_name)['waited_seconds'] += time.monotonic() - started
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+        return ticket
+
+    async def aacquire(self, key_hash: str, model_name: str, stage: str, tokens: int) -> Ticket:
+        # Polls instead of blocking, the event loop runs the other calls meanwhile
+        started = time.monotonic()
+        ticket = self._enqueue(key_hash, model_name, stage, tokens)
+        try:
+            while True:
+                with self._condition:
+                    wait = self._try_admit(ticket)
+                    if wait is None:
+                        self._model_stats(model_name)['waited_seconds'] += time.monotonic() - started
+                        return ticket
+                await asyncio.sleep(min(wait, 0.1))
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+
+    def release(self, ticket: Ticket, used_tokens: Optional[int] = None):
+        # Returns the slot and corrects the token bucket with the real usage when it is known
+        with self._condition:
+            self.in_flight -= 1
+            if used_tokens is not None:
+                self._model_buckets(ticket.limits_key)[1].charge(used_tokens - ticket.tokens)
+            self._condition.notify_all()
+
+    def backoff(self, ticket: Ticket, attempt: int, error: Exception) -> float:
+        # Full jitter exponential backoff, a Retry-After from the provider is respected and pauses the model
+        # for the ticket's API key
+        delay = random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        with self._condition:
+            stats = self._model_stats(ticket.model_name)
+            stats['retries'] += 1
+            if isinstance(error, openai.RateLimitError):
+                stats['rate_limited'] += 1
+                self._paused_until[ticket.limits_key] = max(self._paused_until.get(ticket.limits_key, 0.0),
+                                                            time.monotonic() + delay)
+        metrics.count('retries')
+        logger.warning("%s call failed with %s, retry %d of %d in %.1f s", ticket.model_name, type(error).__name__,
+                       attempt + 1, MAX_RETRIES, delay)
+        return delay
+
+
+def retryable(error: Exception) -> bool:
+    return getattr(error, 'code', None) not in PERMANENT_ERROR_CODES
+
+
+def estimate_tokens(stage: str, prompt_tokens: int) -> int:
+    return prompt_tokens + EXPECTED_COMPLETION_TOKENS.get(stage.removesuffix('_repair'), DEFAULT_COMPLETION_TOKENS)
+
+
+def used_tokens(usage: Optional[Dict]) -> Optional[int]:
+    if not usage:
+        return None
+    return usage.get('total_tokens') or usage.get('prompt_tokens', 0) + usage.get('completion_tokens', 0)
+
+
+def call(key_hash: str, model_name: str, stage: str, prompt_tokens: int, fn: Callable,
+         usage: Callable = lambda result: None):
+    # Runs fn once admitted under the limits of the API key (clients.api_key_hash) and model, retrying rate
+    # limits and transient errors. usage(result) gives the provider's token usage of the result, if any.
+    scheduler = get_scheduler()
+    tokens = estimate_tokens(stage, prompt_tokens)
+    for attempt in range(MAX_RETRIES + 1):
+        ticket = scheduler.acquire(key_hash, model_name, stage, tokens)
+        try:
+            result = fn()
+        except RETRYABLE_ERRORS as e:
+            scheduler.release(ticket, 0)
+            if attempt == MAX_RETRIES or not retryable(e):
+                raise
+            time.sleep(scheduler.backoff(ticket, attempt, e))
+            continue
+        except BaseException:
+            scheduler.release(ticket)
+            raise
+        scheduler.release(ticket, used_tokens(usage(result)))
+        return result
+
+
+async def acall(key_hash: str, model_name: str, stage: str, prompt_tokens: int, fn: Callable[[], Awaitable],
+                usage: Callable = lambda result: None):
+    scheduler = get_scheduler()
+    tokens = estimate_tokens(stage, prompt_tokens)
+    for attempt in range(MAX_RETRIES + 1):
+        ticket = await scheduler.aacquire(key_hash, model_name, stage, tokens)
+        try:
+            result = await fn()
+        except RETRYABLE_ERRORS as e:
+            scheduler.release(ticket, 0)
+            if attempt == MAX_RETRIES or not retryable(e):
+                raise
+            await asyncio.sleep(scheduler.backoff(ticket, attempt, e))
+            continue
+        except BaseException:
+            scheduler.release(ticket)
+            raise
+        scheduler.release(ticket, used_tokens(usage(result)))
+        return result
+
+
+def stream(key_hash: str, model_name: str, stage: str, prompt_tokens: int,
+           make_stream: Callable[[], Iterator]) -> Iterator:
+    # Streaming version of call, a failure is only retried before the first item has been yielded.
+    # Streams report no usage, the estimate stays charged.
+    scheduler = get_scheduler()
+    tokens = estimate_tokens(stage, prompt_tokens)
+    for attempt in range(MAX_RETRIES + 1):
+        ticket = scheduler.acquire(key_hash, model_name, stage, tokens)
+        started = False
+        try:
+            for item in make_stream():
+                started = True
+                yield item
+        except RETRYABLE_ERRORS as e:
+            scheduler.release(ticket, 0 if not started else None)
+            if started or attempt == MAX_RETRIES or not retryable(e):
+                raise
+            time.sleep(scheduler.backoff(ticket, attempt, e))
+            continue
+        except BaseException:
+            scheduler.release(ticket)
+            raise
+        scheduler.release(ticket)
+        return
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler()
+    return _scheduler
@@ -0,0 +1,155 @@
+from typing import Callable, Dict, Iterator, Optional
+from concurrent.futures import Future
+import functools
+import json
+import threading
+
+_lock = threading.Lock()
+_in_flight = {}
+_streams = {}
+# Calls and calls that waited for an identical in-flight call instead of running, per group
+counters = {}
+
+
+class Relay:
+    # Passes the leader's progress calls on to the progress of every caller of a flight, a caller that joins
+    # late first gets the calls it missed
+    def __init__(self):
+        self.calls = []
+        self.subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, progress: Callable):
+        with self._lock:
+            for args, kwargs in self.calls:
+                progress(*args, **kwargs)
+            self.subscribers.append(progress)
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            self.calls.append((args, kwargs))
+            for progress in self.subscribers:
+                progress(*args, **kwargs)
+
+
+def do(group: str, key, fn: Callable, *args, progress: Optional[Callable] = None, **kwargs):
+    # The first caller with a given (group, key) runs fn, concurrent callers with the same key wait for
+    # its result (or exception) instead of running it again. With progress, fn is called with progress= a
+    # Relay that reaches the progress of every caller.
+    flight_key = (group, key)
+    with _lock:
+        stats = counters.setdefault(group, {'calls': 0, 'coalesced': 0})
+        stats['calls'] += 1
+        flight = _in_flight.get(flight_key)
+        leader = flight is None
+        if leader:
+            flight = _in_flight[flight_key] = (Future(), Relay())
+        else:
+            stats['coalesced'] += 1
+    future, relay = flight
+    if progress is not None:
+        relay.subscribe(progress)
+    if not leader:
+        return future.result()
+    try:
+        result = fn(*args, **kwargs, **({'progress': relay} if progress is not None else {}))
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _lock:
+            del _in_flight[flight_key]
+
+
+class Buffer:
+    # Items of a leading stream, for the callers following it
+    def __init__(self):
+        self.items = []
+        self.done = False
+        self.error = None
+        self._condition = threading.Condition()
+
+    def put(self, item):
+        with self._condition:
+            self.items.append(item)
+            self._condition.notify_all()
+
+    def finish(self, error: Optional[BaseException] = None):
+        with self._condition:
+            self.done = True
+            self.error = error
+            self._condition.notify_all()
+
+    def follow(self) -> Iterator:
+        position = 0
+        while True:
+            with self._condition:
+                while position == len(self.items) and not self.done:
+                    self._condition.wait()
+                items = self.items[position:]
+                done, error = self.done, self.error
+            yield from items
+            position += len(items)
+            if done:
+                if error is not None:
+                    raise error
+                return
+
+
+def stream(group: str, key, make_iterator: Callable[[], Iterator]) -> Iterator:
+    # Streaming do: the first caller to start iterating with a given (group, key) iterates make_iterator(),
+    # concurrent callers with the same key get the same items from the start, as the leader produces them.
+    # A leader that stops early fails its followers.
+    flight_key = (group, key)
+    with _lock:
+        stats = counters.setdefault(group, {'calls': 0, 'coalesced': 0})
+        stats['calls'] += 1
+        buffer = _streams.get(flight_key)
+        leader = buffer is None
+        if leader:
+            buffer = _streams[flight_key] = Buffer()
+        else:
+            stats['coalesced'] += 1
+    if not leader:
+        yield from buffer.follow()
+        return
+    try:
+        for item in make_iterator():
+            buffer.put(item)
+            yield item
+    except GeneratorExit:
+        buffer.finish(RuntimeError(f"The leading {group} stream was closed before it finished"))
+        raise
+    except BaseException as e:
+        buffer.finish(e)
+        raise
+    else:
+        buffer.finish()
+    finally:
+        with _lock:
+            del _streams[flight_key]
+
+
+def args_key(*args, **kwargs) -> str:
+    # Objects that can't be serialised (models) are identified by identity, the client registry gives one
+    # model object per API key and model name
+    return json.dumps([args, kwargs], ensure_ascii=False, sort_keys=True,
+                      default=lambda o: f'{type(o).__name__}@{id(o)}')
+
+
+def coalesced(group: str):
+    # Decorator for the pipeline stages, identical concurrent calls share one execution
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return do(group, args_key(*args, **kwargs), fn, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def stats() -> Dict:
+    with _lock:
+        return {group: dict(values) for group, values in counters.items()}
@@ -0,0 +1,136 @@
+from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import logging
+import threading
+import time
+import metrics
+import translation_memory
+
+logger = logging.getLogger(__name__)
+
+# Strings are joined with a line break and sent as one request, the limit of the web API is 5000 characters
+BATCH_SEPARATOR = '\n'
+BATCH_MAX_CHARS = 4500
+MAX_WORKERS = 4
+
+_translator = None
+_translator_lock = threading.Lock()
+
+# Number of requests sent to the translation service, to compare with the memory hits
+network_calls = 0
+# Moving average of translate_tree wall time, what the native generation modes save
+average_tree_seconds = None
+
+
+def get_translator():
+    # One shared translator, so every request reuses the same HTTP client and its connections.
+    # googletrans is imported here, only when something has to be translated.
+    global _translator
+    with _translator_lock:
+        if _translator is None:
+            import googletrans
+            _translator = googletrans.Translator()
+    return _translator
+
+
+def set_translator(translator):
+    # Replaces the shared translator (anything with translate(text, dest=...).text), None goes back to googletrans
+    global _translator
+    with _translator_lock:
+        _translator = translator
+
+
+def collect_strings(data, strings: Dict[str, None]) -> Dict[str, None]:
+    # Collects unique leaf strings in order of appearance (a dict keeps the order, unlike a set)
+    if isinstance(data, dict):
+        for value in data.values():
+            collect_strings(value, strings)
+    elif isinstance(data, list):
+        for item in data:
+            collect_strings(item, strings)
+    elif isinstance(data, str) and data.strip():
+        strings[data] = None
+    return strings
+
+
+def apply_translations(data, translations: Dict[str, str]):
+    if isinstance(data, dict):
+        return {k: apply_translations(v, translations) for k, v in data.items()}
+    elif isinstance(data, list):
+        return [apply_translations(item, translations) for item in data]
+    elif isinstance(data, str):
+        return translations.get(data, data)
+    else:
+        return data
+
+
+def make_batches(texts: List[str]) -> List[List[str]]:
+    batches = []
+    batch = []
+    size = 0
+    for text in texts:
+        # A string with its own line breaks can't be split back reliably, so it goes alone
+        if BATCH_SEPARATOR in text or len(text) >= BATCH_MAX_CHARS:
+            batches.append([text])
+            continue
+        if batch and size + len(text) + len(BATCH_SEPARATOR) > BATCH_MAX_CHARS:
+            batches.append(batch)
+            batch = []
+            size = 0
+        batch.append(text)
+        size += len(text) + len(BATCH_SEPARATOR)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _translate(text: str, dest_language: str) -> str:
+    global network_calls
+    network_calls += 1
+    metrics.count('translation_calls')
+    return get_translator().translate(text, dest=dest_language).text
+
+
+def translate_batch(texts: List[str], dest_language: str = 'uk') -> List[str]:
+    if len(texts) == 1:
+        return [_translate(texts[0], dest_language)]
+    translated = [line.strip() for line in _translate(BATCH_SEPARATOR.join(texts), dest_language).split(BATCH_SEPARATOR)]
+    if len(translated) != len(texts):
+        # The service merged or split lines, translate this batch string by string
+        translated = [_translate(text, dest_language) for text in texts]
+    return translated
+
+
+def translate_strings(texts: List[str], dest_language: str = 'uk') -> Dict[str, str]:
+    # The translation memory is checked first, only the misses go to the network
+    memory = translation_memory.get_memory()
+    translations = memory.get_many(texts, dest_language)
+    batches = make_batches([text for text in texts if text not in translations])
+    if not batches:
+        return translations
+    translated_now = {}
+    # Each batch runs in a copy of this context, so the calls are counted for the current request
+    contexts = [contextvars.copy_context() for _ in batches]
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(batches))) as executor:
+        results = executor.map(lambda context, batch: context.run(translate_batch, batch, dest_language),
+                               contexts, batches)
+        for batch, translated in zip(batches, results):
+            translated_now.update(zip(batch, translated))
+    memory.put_many(translated_now, dest_language)
+    translations.update(translated_now)
+    return translations
+
+
+@metrics.timed('translation')
+def translate_tree(data, dest_language: str = 'uk'):
+    # Collects every unique leaf string, translates them in a few concurrent batches and writes them back
+    global average_tree_seconds
+    started = time.perf_counter()
+    texts = list(collect_strings(data, {}))
+    translations = translate_strings(texts, dest_language)
+    seconds = time.perf_counter() - started
+    average_tree_seconds = seconds if average_tree_seconds is None else 0.8 * average_tree_seconds + 0.2 * seconds
+    logger.info("Translated %d strings in %.2f s, translation memory: %s, network calls so far: %d",
+                len(texts), seconds, translation_memory.get_memory().stats(), network_calls)
+    return apply_translations(data, translations)
@@ -0,0 +1,140 @@
+from typing import Dict, Iterable, List
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.environ.get('DIET_BOT_TRANSLATION_MEMORY',
+                              os.path.join(os.path.expanduser('~'), '.cache', 'diet-bot', 'translations.sqlite3'))
+DEFAULT_MAX_ENTRIES = 50000
+
+# Meal descriptions and units the menu generator produces in almost every response
+MEAL_GLOSSARY = {
+    'Breakfast': 'Сніданок',
+    'First breakfast': 'Перший сніданок',
+    'Second breakfast': 'Другий сніданок',
+    'Lunch': 'Обід',
+    'Afternoon snack': 'Полуденок',
+    'Snack': 'Перекус',
+    'Dinner': 'Вечеря',
+    'Late dinner': 'Пізня вечеря',
+    'Evening snack': 'Вечірній перекус',
+    'UAH': 'грн',
+}
+
+
+def mine_glossary(diet_data_list: List[Dict], diet_data_list_en: List[Dict]) -> Dict[str, str]:
+    # The hand-written MEAL_GLOSSARY and the parallel English/Ukrainian diet fields as whole texts, both
+    # translations as written. Single list items are not paired up, the Ukrainian fields inflect them
+    # ('buckwheat' -> 'гречана') and a one-word string gets the case form back instead of the noun.
+    glossary = {}
+    for diet_uk, diet_en in zip(diet_data_list, diet_data_list_en):
+        for key, text_en in diet_en.items():
+            text_uk = diet_uk.get(key)
+            if isinstance(text_en, str) and text_uk and text_en != text_uk:
+                glossary[text_en] = text_uk
+    glossary.update(MEAL_GLOSSARY)
+    return glossary
+
+
+class TranslationMemory:
+    # SQLite translation memory keyed by (source text, target language), evicts the least recently
+    # used entries above max_entries, glossary entries are pinned and never evicted.
+    def __init__(self, path: str = DEFAULT_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " source TEXT NOT NULL, dest TEXT NOT NULL, translation TEXT NOT NULL,"
+            " pinned INTEGER NOT NULL DEFAULT 0, last_used REAL NOT NULL,"
+            " PRIMARY KEY (source, dest));"
+            "CREATE INDEX IF NOT EXISTS translations_last_used ON translations (pinned, last_used);"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+        )
+
+    def get_many(self, texts: Iterable[str], dest: str) -> Dict[str, str]:
+        texts = list(texts)
+        found = {}
+        with self._lock:
+            for start in range(0, len(texts), 500):
+                chunk = texts[start:start + 500]
+                rows = self._connection.execute(
+                    f"SELECT source, translation FROM translations WHERE dest = ? "
+                    f"AND source IN ({', '.join('?' * len(chunk))})", [dest, *chunk]).fetchall()
+                found.update(rows)
+            if found:
+                self._connection.executemany(
+                    "UPDATE translations SET last_used = ? WHERE source = ? AND dest = ?",
+                    [(time.time(), source, dest) for source in found])
+                self._connection.commit()
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+        return found
+
+    def put_many(self, translations: Dict[str, str], dest: str, pinned: bool = False):
+        now = time.time()
+        with self._lock:
+            self._connection.executemany(
+                "INSERT INTO translations (source, dest, translation, pinned, last_used) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, dest) DO UPDATE SET translation = excluded.translation, "
+                "pinned = MAX(pinned, excluded.pinned), last_used = excluded.last_used",
+                [(source, dest, text, int(pinned), now) for source, text in translations.items()])
+            self._evict()
+            self._connection.commit()
+
+    def _evict(self):
+        size = self._connection.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        if size > self.max_entries:
+            self._connection.execute(
+                "DELETE FROM translations WHERE rowid IN (SELECT rowid FROM translations WHERE pinned = 0 "
+                "ORDER BY last_used LIMIT ?)", (size - self.max_entries,))
+
+    def seed(self, glossary: Dict[str, str], dest: str = 'uk'):
+        # Seeds the glossary (pinned) once per version of it. A new version drops the memory for dest first,
+        # translations served from an earlier glossary (or the list items it used to mine) are not kept.
+        version = hashlib.sha256(repr(sorted(glossary.items())).encode()).hexdigest()
+        key = f'glossary:{dest}'
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        if row and row[0] == version:
+            return
+        with self._lock:
+            self._connection.execute("DELETE FROM translations WHERE dest = ?", (dest,))
+        self.put_many(glossary, dest, pinned=True)
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, version))
+            self._connection.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': self.size(),
+        }
+
+
+_memory = None
+_memory_lock = threading.Lock()
+
+
+def get_memory() -> TranslationMemory:
+    global _memory
+    with _memory_lock:
+        if _memory is None:
+            import diets
+            _memory = TranslationMemory(DEFAULT_PATH)
+            _memory.seed(mine_glossary(diets.get_diet_data_list(), diets.get_diet_data_list_en()))
+    return _memory